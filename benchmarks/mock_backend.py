@@ -0,0 +1,429 @@
+"""
+Local stand-in for the SOTW backend serving synthetic data.
+
+Run standalone to point the app at it:
+
+    python -m benchmarks.mock_backend --port 8022 --rows-per-series 5000 --latency 0.05
+    API_BASE_URL=http://127.0.0.1:8022 ENVIRON=development streamlit run frontend.py
+"""
+
+import argparse
+import gzip
+import json
+import zlib
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+from benchmarks.synthetic import TIMESTAMP_FORMAT, DatasetSpec, generate_feed, to_records, universes_of
+
+FILTER_COLUMNS = ["source", "topic", "topic_category", "feature_name", "feature_category", "universe_name"]
+BODY_CACHE_SIZE = 64
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+ARROW_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+ARROW_BATCH_ROWS = 65536
+# Wire formats /db/feed can answer in, besides JSON
+FEED_FORMATS = ("arrow", "ndjson") if ARROW_AVAILABLE else ("ndjson",)
+ARTICLES_PER_TOPIC = 3
+CONTENT_TYPES = {"json": "application/json", "ndjson": NDJSON_CONTENT_TYPE, "arrow": ARROW_CONTENT_TYPE}
+
+
+def _utc_ns(value):
+    ts = pd.Timestamp(value)
+    if ts.tz is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return ts.value
+
+
+class MockBackend:
+    """
+    Serve a generated feed over HTTP on a background thread, with an optional fixed latency per request.
+
+    /db/feed answers in any of formats the client's Accept header asks for, else in JSON;
+    set formats to () to emulate a JSON-only backend.
+    """
+
+    def __init__(self, df, latency=0.0, host="127.0.0.1", port=0, compress=True, formats=FEED_FORMATS):
+        self.df = df
+        self.latency = latency
+        self.compress = compress
+        self.formats = formats
+        self.records = to_records(df)
+        self.universes = universes_of(df)
+        self._created_ns = df["created_timestamp"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+        self._columns = {col: df[col].to_numpy() for col in FILTER_COLUMNS}
+        self._arrow_table = _arrow_table(df) if "arrow" in formats else None
+        self._bodies = OrderedDict()
+        self._bodies_lock = threading.Lock()
+        self.request_count = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-backend", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _feed_indices(self, query):
+        mask = np.ones(len(self.records), dtype=bool)
+        for col in FILTER_COLUMNS:
+            if col in query:
+                mask &= self._columns[col] == query[col]
+        if "since" in query:
+            mask &= self._created_ns >= _utc_ns(query["since"])
+        if "until" in query:
+            mask &= self._created_ns <= _utc_ns(query["until"])
+        indices = np.flatnonzero(mask)
+        if "limit" in query:
+            indices = indices[-int(query["limit"]) :]
+        return indices
+
+    def feed_rows(self, query):
+        """Return the row dicts matching /db/feed query params."""
+        rows = [self.records[i] for i in self._feed_indices(query)]
+        if "columns" in query:
+            columns = query["columns"].split(",")
+            rows = [{col: row[col] for col in columns if col in row} for row in rows]
+        return rows
+
+    def feed_arrow(self, query):
+        """Return the /db/feed rows matching query params as an Arrow IPC stream."""
+        table = self._arrow_table.take(self._feed_indices(query))
+        if "columns" in query:
+            table = table.select([col for col in query["columns"].split(",") if col in table.column_names])
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            for batch in table.to_batches(max_chunksize=ARROW_BATCH_ROWS):
+                writer.write_batch(batch)
+        return sink.getvalue().to_pybytes()
+
+    def catalog(self, query):
+        df = self.df
+        if "universe_name" in query:
+            df = df[df["universe_name"] == query["universe_name"]]
+        catalog = (
+            df.groupby(["source", "topic", "feature_name"])
+            .agg(
+                feature_is_target=("feature_is_target", "any"),
+                first_timestamp=("created_timestamp", "min"),
+                last_timestamp=("created_timestamp", "max"),
+                row_count=("created_timestamp", "count"),
+            )
+            .reset_index()
+        )
+        for col in ["first_timestamp", "last_timestamp"]:
+            catalog[col] = catalog[col].dt.strftime("%Y-%m-%dT%H:%M:%S.%f")
+        return catalog.to_dict("records")
+
+    def get_payload(self, path, query):
+        if path == "/health":
+            return {"status": "OK", "db": "OK"}
+        if path == "/db/universes":
+            return {"universes": self.universes}
+        if path == "/db/feed":
+            return {"data": self.feed_rows(query)}
+        if path == "/db/feed/catalog":
+            return {"data": self.catalog(query)}
+        if path == "/db/feed/latest-timestamp":
+            rows = self.feed_rows(query)
+            return {"latest_timestamp": rows[-1]["created_timestamp"] if rows else None}
+        if path == "/news/top":
+            count = int(query.get("max_results", 10))
+            news = [{"title": f"Headline {i}", "description": "Synthetic news"} for i in range(count)]
+            return {"data": news, "count": count}
+        return None
+
+    def post_payload(self, path, universe):
+        if not path.startswith("/feed/"):
+            return None
+        source = path.rsplit("/", 1)[-1]
+        topics = [topic["name"] for topic in (universe or {}).get("topics", [])]
+        rng = np.random.default_rng(zlib.crc32(f"{source}:{','.join(topics)}".encode()))
+        published = self.df["created_timestamp"].max().strftime(TIMESTAMP_FORMAT)
+        if source == "meteo":
+            return {"universe_feeds": [_meteo_feed(topic, published, rng) for topic in topics]}
+        build = SOURCE_FEEDS.get(source, _generic_feed)
+        feeds = [build(topic, published, rng) for topic in topics]
+        averages = [feed.get("sentiment_average", feed.get("finlight_sentiment_average", 0.0)) for feed in feeds]
+        return {"universe_feeds": feeds, "overall_sentiment_average": float(np.mean(averages)) if feeds else 0.0}
+
+    def feed_format(self, accept):
+        """Pick the /db/feed wire format for an Accept header (the first supported one it lists)."""
+        offered = [part.split(";")[0].strip() for part in accept.split(",")]
+        for content_type in offered:
+            for feed_format in self.formats:
+                if CONTENT_TYPES[feed_format] == content_type:
+                    return feed_format
+        return "json"
+
+    def _body(self, key, build, serialize=None):
+        """Serialize a payload once per distinct request; repeated requests reuse the bytes."""
+        with self._bodies_lock:
+            body = self._bodies.get(key)
+            if body is not None:
+                self._bodies.move_to_end(key)
+                return body
+        payload = build()
+        if payload is None:
+            return None
+        body = serialize(payload) if serialize is not None else json.dumps(payload).encode()
+        with self._bodies_lock:
+            self._bodies[key] = body
+            while len(self._bodies) > BODY_CACHE_SIZE:
+                self._bodies.popitem(last=False)
+        return body
+
+    def _handler_class(self):
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, body, content_type="application/json"):
+                backend.request_count += 1
+                if backend.latency:
+                    time.sleep(backend.latency)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                if backend.compress and len(body) > 1024 and "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = gzip.compress(body, compresslevel=1)
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                feed_format = backend.feed_format(self.headers.get("Accept", "")) if url.path == "/db/feed" else "json"
+                if feed_format == "ndjson":
+                    body = backend._body(("ndjson", self.path), lambda: backend.feed_rows(query), _ndjson)
+                    self._send(body, NDJSON_CONTENT_TYPE)
+                    return
+                if feed_format == "arrow":
+                    body = backend._body(("arrow", self.path), lambda: backend.feed_arrow(query), bytes)
+                    self._send(body, ARROW_CONTENT_TYPE)
+                    return
+                self._send(backend._body(self.path, lambda: backend.get_payload(url.path, query)))
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                universe = json.loads(self.rfile.read(length) or b"null")
+                payload = backend.post_payload(urlparse(self.path).path, universe)
+                self._send(json.dumps(payload).encode() if payload is not None else None)
+
+        return Handler
+
+
+def _sentiment(rng):
+    return round(float(rng.uniform(-1, 1)), 4)
+
+
+def _generic_feed(topic, published, rng):
+    return {"topic": topic, "sentiment_average": _sentiment(rng)}
+
+
+def _reddit_feed(topic, published, rng):
+    return {
+        "topic": topic,
+        "sentiment_average": _sentiment(rng),
+        "num_submissions": int(rng.integers(1, 50)),
+        "num_comments": int(rng.integers(0, 500)),
+        "last_timestamp": published,
+    }
+
+
+def _alpha_feed(topic, published, rng):
+    articles = [
+        {
+            "title": f"{topic} headline {i}",
+            "url": f"https://example.com/alpha/{topic}/{i}",
+            "source": "Synthetic",
+            "published_on": published,
+            "summary": f"Synthetic Alpha Vantage summary {i} for {topic}.",
+            "banner_image": f"https://example.com/alpha/{topic}/{i}.png",
+            "sentiment": "Neutral",
+            "sentiment_score": _sentiment(rng),
+            "relevance_score": round(float(rng.uniform(0, 1)), 4),
+        }
+        for i in range(ARTICLES_PER_TOPIC)
+    ]
+    return {
+        "topic": topic,
+        "sentiment_average": float(np.mean([item["sentiment_score"] for item in articles])),
+        "article_count": len(articles),
+        "latest_article": articles[0],
+        "articles": articles,
+    }
+
+
+def _newsapi_feed(topic, published, rng):
+    articles = [
+        {
+            "headline": f"{topic} headline {i}",
+            "published_date": published,
+            "description": f"Synthetic NewsAPI description {i} for {topic}.",
+            "sentiment": _sentiment(rng),
+        }
+        for i in range(ARTICLES_PER_TOPIC)
+    ]
+    return {
+        "topic": topic,
+        "sentiment_average": float(np.mean([item["sentiment"] for item in articles])),
+        "article_count": len(articles),
+        "latest_article": articles[0],
+        "articles": articles,
+    }
+
+
+def _gnews_feed(topic, published, rng):
+    news = [
+        {
+            "title": f"{topic} headline {i}",
+            "published date": published,
+            "description": f"Synthetic GNews description {i} for {topic}.",
+            "vader_sentiment": _sentiment(rng),
+            "finbert_sentiment": _sentiment(rng),
+        }
+        for i in range(ARTICLES_PER_TOPIC)
+    ]
+    vader = float(np.mean([item["vader_sentiment"] for item in news]))
+    return {
+        "topic": topic,
+        "sentiment_average": vader,
+        "vader_sentiment": vader,
+        "finbert_sentiment": float(np.mean([item["finbert_sentiment"] for item in news])),
+        "article_count": len(news),
+        "latest_article": news[0],
+        "news": news,
+    }
+
+
+def _finlight_feed(topic, published, rng):
+    articles = [
+        {
+            "title": f"{topic} headline {i}",
+            "published_date": published,
+            "source": "Synthetic",
+            "link": f"https://example.com/finlight/{topic}/{i}",
+            "content": f"Synthetic Finlight content {i} for {topic}.",
+            "images": [],
+            "finlight_sentiment": _sentiment(rng),
+            "finbert_sentiment": _sentiment(rng),
+            "vader_sentiment": _sentiment(rng),
+        }
+        for i in range(ARTICLES_PER_TOPIC)
+    ]
+    averages = {
+        f"{model}_sentiment_average": float(np.mean([item[f"{model}_sentiment"] for item in articles]))
+        for model in ("finlight", "finbert", "vader")
+    }
+    return {
+        "topic": topic,
+        **averages,
+        "article_count": len(articles),
+        "latest_article": articles[0],
+        "articles": articles,
+    }
+
+
+def _meteo_feed(topic, published, rng):
+    pollutants = ["us_aqi", "pm10", "pm2_5", "carbon_monoxide", "nitrogen_dioxide", "sulphur_dioxide", "ozone"]
+    return {
+        "city": topic,
+        "air_quality": {name: round(float(rng.uniform(0, 200)), 1) for name in pollutants},
+        "timestamp": published,
+    }
+
+
+# /feed/<source> -> builder of one topic's entry in universe_feeds, with the keys the source UI reads
+SOURCE_FEEDS = {
+    "reddit": _reddit_feed,
+    "alpha": _alpha_feed,
+    "newsapi": _newsapi_feed,
+    "gnews": _gnews_feed,
+    "finlight": _finlight_feed,
+}
+
+
+def _arrow_table(df):
+    """Type the generated feed like a columnar backend would: dictionary strings and UTC timestamps."""
+    df = df.copy()
+    for col in FILTER_COLUMNS:
+        df[col] = df[col].astype("category")
+    for col in ["created_timestamp", "original_timestamp"]:
+        # Same microsecond precision as the JSON timestamp strings, so both formats carry equal values
+        df[col] = df[col].dt.floor("us").dt.tz_localize("UTC")
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def _ndjson(rows):
+    return b"".join(json.dumps(row).encode() + b"\n" for row in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8022)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--universes", type=int, default=DatasetSpec.universes)
+    parser.add_argument("--sources", type=int, default=DatasetSpec.sources)
+    parser.add_argument("--topics", type=int, default=DatasetSpec.topics)
+    parser.add_argument("--features", type=int, default=DatasetSpec.features)
+    parser.add_argument("--rows-per-series", type=int, default=DatasetSpec.rows_per_series)
+    parser.add_argument("--interval-seconds", type=int, default=DatasetSpec.interval_seconds)
+    parser.add_argument("--formats", default=",".join(FEED_FORMATS), help="Formats /db/feed offers besides JSON")
+    parser.add_argument("--json-only", action="store_true", help="Answer /db/feed in JSON whatever the client accepts")
+    args = parser.parse_args()
+
+    spec = DatasetSpec(
+        universes=args.universes,
+        sources=args.sources,
+        topics=args.topics,
+        features=args.features,
+        rows_per_series=args.rows_per_series,
+        interval_seconds=args.interval_seconds,
+    )
+    formats = () if args.json_only else tuple(fmt for fmt in args.formats.split(",") if fmt)
+    backend = MockBackend(
+        generate_feed(spec), latency=args.latency, host=args.host, port=args.port, formats=formats
+    ).start()
+    print(f"Serving {spec.total_rows} synthetic feed rows at {backend.url} (Ctrl+C to stop)")
+    try:
+        backend._thread.join()
+    except KeyboardInterrupt:
+        backend.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Benchmark the frontend's data paths and pages against a local mock backend.
+
+Run from the repository root:
+
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --rows-per-series 10000 --latency 0.05 --json bench.json
+    python -m benchmarks.run_benchmarks --only parse --only filter
+
+Every benchmark reports min/median/max wall time over --repeat runs and the peak memory
+allocated by one extra run under tracemalloc.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+
+import requests
+
+from benchmarks.mock_backend import MockBackend
+from benchmarks.synthetic import DatasetSpec, generate_feed, to_records
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FRONTEND_SCRIPT = os.path.join(REPO_ROOT, "frontend.py")
+
+
+@dataclass
+class Result:
+    name: str
+    timings: list = field(default_factory=list)
+    peak_bytes: int = 0
+    note: str = ""
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "runs": len(self.timings),
+            "min_s": min(self.timings),
+            "median_s": statistics.median(self.timings),
+            "max_s": max(self.timings),
+            "peak_mib": self.peak_bytes / 1024**2,
+            "note": self.note,
+        }
+
+
+def measure(name, func, repeat, setup=None, note=""):
+    """Time func over repeat runs (calling setup before each), then measure its peak memory once."""
+    result = Result(name, note=note)
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        result.timings.append(time.perf_counter() - start)
+
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        func()
+        result.peak_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result
+
+
+def build_benchmarks(backend):
+    """Return (name, func, setup, note) tuples; app modules are imported here, after the environment is set."""
+    from streamlit.testing.v1 import AppTest
+
+    from utils import api_client
+    from utils.api_client import APIClient
+    from utils.feed_ingest import feed_frame_from_records
+    from utils.feed_store import clear_feed_stores
+    from utils.feed_catalog import get_feed_catalog
+    from utils.general_utils import TIME_WINDOW_OPTIONS, TIME_WINDOW_ALL, TIME_WINDOW_WEEK, filter_dataframe_by_time
+    from utils.plot_utils import create_one_feature_plot
+    from ui.correlation_finder_ui import calculate_correlation
+
+    universe = backend.universes[0]["universe_name"]
+    records = [row for row in to_records(backend.df) if row["universe_name"] == universe]
+    feed = feed_frame_from_records(records)
+    source, topic = feed["source"].iloc[0], feed["topic"].iloc[0]
+    numeric = feed[feed["feature_category"] == "numeric"]
+    feature_1, feature_2 = sorted(numeric["feature_name"].unique())[:2]
+
+    def clear_all():
+        APIClient.clear_cache()
+        api_client._delta_cache.invalidate()
+        api_client._disk_cache.invalidate()
+        clear_feed_stores()
+        get_feed_catalog.clear()
+
+    def clear_results():
+        # Keep the incremental base frames so only rows newer than them are fetched
+        APIClient.clear_cache()
+        clear_feed_stores()
+
+    def with_formats(formats, func):
+        # Restrict the wire formats the backend offers, to compare them with the negotiated one
+        def run():
+            offered, backend.formats = backend.formats, formats
+            try:
+                func()
+            finally:
+                backend.formats = offered
+
+        return run
+
+    def fetch_feed():
+        APIClient.get_feed_from_db(universe_name=universe)
+
+    def http_only():
+        response = requests.get(f"{backend.url}/db/feed", params={"universe_name": universe})
+        response.raise_for_status()
+        response.json()
+
+    def filter_all_windows():
+        for time_window in TIME_WINDOW_OPTIONS:
+            filter_dataframe_by_time(feed, time_window)
+
+    def feature_plots():
+        for time_window in (TIME_WINDOW_WEEK, TIME_WINDOW_ALL):
+            fig, _ = create_one_feature_plot(universe, source, topic, feature_1, time_window)
+            fig.to_json()
+
+    def series(feature_name):
+        rows = numeric[(numeric["source"] == source) & (numeric["topic"] == topic)]
+        rows = rows[rows["feature_name"] == feature_name].copy()
+        rows["feature_value"] = rows["feature_value"].astype(float)
+        return rows
+
+    df1, df2 = series(feature_1), series(feature_2)
+
+    def page(*button_labels):
+        # Click through button_labels in order, e.g. a tab and then a button on it
+        def run():
+            app = AppTest.from_file(FRONTEND_SCRIPT, default_timeout=300).run()
+            for button_label in button_labels:
+                next(b for b in app.button if b.label == button_label).click().run()
+            # Fetch all reports a failing source with st.error instead of raising
+            failures = [element.value for element in [*app.exception, *app.error]]
+            if failures:
+                raise RuntimeError(f"{' > '.join(button_labels) or 'Universe'} page failed: {failures[0]}")
+
+        return run
+
+    rows = f"{len(records)} rows"
+    return [
+        ("http_feed_json", http_only, None, f"{rows}, HTTP + JSON decode only"),
+        ("parse_feed_records", lambda: feed_frame_from_records(records), None, rows),
+        ("get_feed_from_db_cold", fetch_feed, clear_all, f"{rows}, {'/'.join(backend.formats) or 'json'} offered"),
+        ("get_feed_from_db_cold_ndjson", with_formats(("ndjson",), fetch_feed), clear_all, f"{rows}, NDJSON backend"),
+        ("get_feed_from_db_cold_json", with_formats((), fetch_feed), clear_all, f"{rows}, JSON-only backend"),
+        ("get_feed_from_db_incremental", fetch_feed, clear_results, ""),
+        ("filter_dataframe_by_time", filter_all_windows, None, f"{rows}, all {len(TIME_WINDOW_OPTIONS)} windows"),
+        ("create_one_feature_plot", feature_plots, None, "week + all time, incl. figure JSON"),
+        ("calculate_correlation", lambda: calculate_correlation(df1, df2), None, f"{len(df1)} x {len(df2)} rows"),
+        ("page_universe_cold", page(), clear_all, "full script run"),
+        ("page_universe_warm", page(), None, "full script run"),
+        ("page_topic_warm", page("Topic"), None, "full script run"),
+        ("page_correlation_warm", page("Correlation Finder"), None, "full script run"),
+        ("page_sources_fetch_all", page("Sources", "Fetch all"), None, "all sources fetched concurrently"),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the mock backend adds to every response")
+    parser.add_argument("--universes", type=int, default=DatasetSpec.universes)
+    parser.add_argument("--sources", type=int, default=DatasetSpec.sources)
+    parser.add_argument("--topics", type=int, default=DatasetSpec.topics)
+    parser.add_argument("--features", type=int, default=DatasetSpec.features)
+    parser.add_argument("--rows-per-series", type=int, default=DatasetSpec.rows_per_series)
+    parser.add_argument("--only", action="append", help="Run benchmarks whose name contains this (repeatable)")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    spec = DatasetSpec(
+        universes=args.universes,
+        sources=args.sources,
+        topics=args.topics,
+        features=args.features,
+        rows_per_series=args.rows_per_series,
+        text_feature_ratio=0.25,
+    )
+    print(f"Generating {spec.total_rows} synthetic rows...", file=sys.stderr)
+    backend = MockBackend(generate_feed(spec), latency=args.latency).start()
+
+    # config reads these at import time, so set them before importing any app module
+    os.environ.setdefault("ENVIRON", "development")
+    os.environ["API_BASE_URL"] = backend.url
+    os.environ["FEED_DISK_CACHE_DIR"] = tempfile.mkdtemp(prefix="sotw-bench-cache-")
+    sys.path.insert(0, REPO_ROOT)
+
+    results = []
+    try:
+        for name, func, setup, note in build_benchmarks(backend):
+            if args.only and not any(part in name for part in args.only):
+                continue
+            print(f"Running {name}...", file=sys.stderr)
+            results.append(measure(name, func, args.repeat, setup, note).as_dict())
+    finally:
+        backend.stop()
+
+    print(f"\n{'benchmark':32} {'min s':>9} {'median s':>9} {'max s':>9} {'peak MiB':>9}  note")
+    for row in results:
+        print(
+            f"{row['name']:32} {row['min_s']:9.4f} {row['median_s']:9.4f} {row['max_s']:9.4f} "
+            f"{row['peak_mib']:9.1f}  {row['note']}"
+        )
+    print(f"\nMock backend served {backend.request_count} requests")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            from utils import perf
+
+            report = {"dataset": spec.__dict__, "latency": args.latency, "results": results, "perf": perf.snapshot()}
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Synthetic feed data shaped like the backend's /db/feed rows."""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Layout the backend uses for timestamps (matches config.FEED_TIMESTAMP_FORMAT)
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+@dataclass
+class DatasetSpec:
+    universes: int = 1
+    sources: int = 4
+    topics: int = 5
+    features: int = 4
+    rows_per_series: int = 2000
+    interval_seconds: int = 600  # Average spacing of rows within a series
+    text_feature_ratio: float = 0.0  # Share of features holding text instead of numbers
+    seed: int = 0
+
+    @property
+    def total_rows(self):
+        return self.universes * self.sources * self.topics * self.features * self.rows_per_series
+
+
+def generate_feed(spec, now=None):
+    """
+    Generate feed rows for every (universe, source, topic, feature) series of spec.
+
+    Returns a DataFrame with the backend's columns; timestamps are naive UTC strings
+    in TIMESTAMP_FORMAT and rows are ordered by created_timestamp.
+    """
+    rng = np.random.default_rng(spec.seed)
+    now = pd.Timestamp.now(tz="UTC").tz_localize(None) if now is None else pd.Timestamp(now)
+    n = spec.rows_per_series
+    text_features = int(round(spec.features * spec.text_feature_ratio))
+
+    frames = []
+    for u in range(spec.universes):
+        for s in range(spec.sources):
+            for t in range(spec.topics):
+                for f in range(spec.features):
+                    # Jittered, strictly increasing offsets back from now
+                    steps = rng.exponential(spec.interval_seconds, n).cumsum()
+                    created = now - pd.to_timedelta(steps[::-1], unit="s")
+                    if f < text_features:
+                        values = rng.choice(["bullish", "bearish", "neutral"], n)
+                    else:
+                        values = (100 + rng.standard_normal(n).cumsum()).round(4).astype(str)
+                    frames.append(
+                        pd.DataFrame(
+                            {
+                                "universe_name": f"U{u + 1}",
+                                "source": f"source_{s + 1}",
+                                "topic": f"TOPIC{t + 1}",
+                                "topic_category": "stock",
+                                "feature_name": f"feature_{f + 1}",
+                                "feature_category": "text" if f < text_features else "numeric",
+                                "feature_value": values,
+                                "feature_is_target": f == text_features,
+                                "created_timestamp": created,
+                                "original_timestamp": created - pd.Timedelta(seconds=30),
+                            }
+                        )
+                    )
+
+    df = pd.concat(frames, ignore_index=True).sort_values("created_timestamp", kind="stable", ignore_index=True)
+    df.insert(0, "id", np.arange(len(df)))
+    return df
+
+
+def to_records(df):
+    """Convert a generated feed to the JSON-ready row dicts the backend returns."""
+    out = df.copy()
+    for col in ["created_timestamp", "original_timestamp"]:
+        out[col] = out[col].dt.strftime(TIMESTAMP_FORMAT)
+    return out.to_dict("records")
+
+
+def universes_of(df):
+    """Build the /db/universes payload for a generated feed."""
+    universes = []
+    for name, rows in df.groupby("universe_name"):
+        topics = [{"name": topic, "description": f"Synthetic {topic}"} for topic in sorted(rows["topic"].unique())]
+        universes.append({"universe_name": name, "topics": topics})
+    return universes
@@ -11,7 +11,55 @@ API_BASE_URLS = {
     "development": "http://localhost:8022",
     "production": "http://51.17.12.158:8022",  # AWS EC2 instance
 }
-API_BASE_URL = API_BASE_URLS.get(envi, API_BASE_URLS["development"])
+# API_BASE_URL in the environment overrides the per-environment URL (e.g. to point at the benchmark mock backend)
+API_BASE_URL = os.environ.get("API_BASE_URL") or API_BASE_URLS.get(envi, API_BASE_URLS["development"])
+
+# HTTP transport settings for the backend API
+API_POOL_CONNECTIONS = 4  # Number of host pools kept by the shared session
+API_POOL_MAXSIZE = 32  # Max keep-alive connections per host (roughly one per Streamlit worker thread)
+API_CONNECT_TIMEOUT = 3.05  # Seconds to establish a TCP connection
+API_READ_TIMEOUT = 30  # Seconds to wait for response data
+# Per-endpoint (connect, read) timeouts in seconds, matched by longest path prefix
+API_ENDPOINT_TIMEOUTS = {
+    "/health": (2, 5),
+    "/db/": (API_CONNECT_TIMEOUT, 60),
+    "/feed/": (API_CONNECT_TIMEOUT, 300),  # Source fetches scrape external APIs and can be slow
+}
+
+# Stale-while-revalidate cache for API results
+API_CACHE_TTL = 300  # Seconds a cached result is served without refreshing
+API_CACHE_MAX_STALE = 3600  # Seconds a stale result may still be served while it refreshes in the background
+API_CACHE_MAX_ENTRIES = 256  # Cached results kept per API method
+API_CACHE_REFRESH_WORKERS = 4  # Background refresh threads
+
+# Incremental feed fetching: full resync interval for the delta cache in seconds
+FEED_DELTA_FULL_REFRESH_SECONDS = 6 * 3600
+
+# Time-window fetches start at the window cutoff floored to this many seconds so they share cache keys
+FEED_WINDOW_GRANULARITY = 300
+
+# Timestamp layout the backend sends (naive values are UTC); other ISO 8601 forms are parsed by a slower fallback
+FEED_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+# Streamed (NDJSON) feed responses are decoded into compact frames this many rows at a time
+FEED_STREAM_BATCH_ROWS = 50000
+FEED_STREAM_CHUNK_BYTES = 1024**2  # Bytes read from the socket per chunk
+
+# Pre-aggregated feed rollups, finest first; long windows read the coarsest one that still has enough points
+FEED_ROLLUP_FREQUENCIES = ["1min", "1h", "1D"]
+CORRELATION_ROLLUP_MIN_POINTS = 1000  # Buckets a rollup must leave in the window to be used for correlation
+
+# In-memory feed frames (incremental bases and cached results) share this many bytes; least recently used go first
+FEED_MEMORY_CACHE_MAX_BYTES = int(os.environ.get("FEED_MEMORY_CACHE_MAX_BYTES") or 512 * 1024**2)
+
+# Persistent Parquet feed cache shared by all sessions and worker processes
+FEED_DISK_CACHE_DIR = os.environ.get("FEED_DISK_CACHE_DIR") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".cache", "feeds"
+)
+FEED_DISK_CACHE_TTL = 300  # Seconds a cached feed is served without asking the backend
+FEED_DISK_CACHE_MAX_AGE = 7 * 24 * 3600  # Seconds a stale feed is kept as a base for incremental fetches
+FEED_DISK_CACHE_MAX_BYTES = 1024**3  # Total size budget for the cache directory
+FEED_DISK_CACHE_MAX_SEGMENTS = 32  # Incremental row segments appended to a cached feed before it is rewritten whole
 
 
 APP_TITLE = "📈 State Of The World"
@@ -23,3 +71,13 @@ STREAMLIT_AUTOREFRESH_INTERVAL = 120  # Auto-refresh interval in seconds for the
 NEGATIVE_SENTIMENT_THRESHOLD = -0.35
 POSITIVE_SENTIMENT_THRESHOLD = 0.35
 SENTIMENT_COLORS = {"negative": "red", "neutral": "gray", "positive": "blue"}
+
+# Performance instrumentation (see utils/perf.py)
+PERF_HISTOGRAM_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]  # Latency histogram bounds
+PERF_MAX_SAMPLES = 1000  # Recent durations kept per timer for percentiles
+PERF_MAX_EVENTS = 5000  # Recent individual measurements kept for export
+
+# Feature plot downsampling and rendering
+PLOT_DEFAULT_WIDTH_PX = 1200  # Assumed plot width when the caller does not know it
+PLOT_POINTS_PER_PIXEL = 2  # Max points per trace relative to the plot width
+PLOT_WEBGL_THRESHOLD = 5000  # Render with WebGL instead of SVG above this many points
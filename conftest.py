@@ -0,0 +1,5 @@
+"""pytest configuration: config.py requires ENVIRON to be set."""
+
+import os
+
+os.environ.setdefault("ENVIRON", "development")
@@ -4,7 +4,7 @@ import streamlit as st
 
 from utils.api_client import APIClient
 from config import APP_TITLE, APP_ICON
-from ui.config_panel_ui import configure_sidebar
+from ui.config_panel_ui import configure_sidebar, display_performance_panel
 from ui.correlation_finder_ui import display_correlation_finder
 from ui.source_ui import display_source_fetch_buttons
 from ui.universe_ui import display_universe
@@ -146,6 +146,8 @@ def main():
     elif st.session_state.active_tab == "sources":
         display_source_fetch_buttons(selected_universe)
 
+    # Rendered last so it includes this rerun's measurements
+    display_performance_panel()
 
     # Handle URL query params for deep linking
     tab_query = st.query_params.get("tab", [None])[0]
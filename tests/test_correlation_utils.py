@@ -0,0 +1,65 @@
+"""Checks of the vectorized correlations against plain pandas computations."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.correlation_utils import correlation_matrix, lagged_cross_correlation, rolling_correlation
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+def test_lagged_cross_correlation_matches_shifted_corr(rng):
+    index = pd.date_range("2024-01-01", periods=200, freq="1h", tz="UTC")
+    x = pd.Series(rng.normal(size=200), index=index)
+    # y follows x three steps later, so x leads y by a positive lag of 3
+    y = x.shift(3) + 0.3 * pd.Series(rng.normal(size=200), index=index)
+    # Missing buckets must be excluded pairwise, including where the FFT wraps around
+    x.iloc[[5, 50, 51, 199]] = np.nan
+    y.iloc[[0, 1, 120]] = np.nan
+
+    result = lagged_cross_correlation(x, y, "1h", max_lag_steps=10).set_index("lag")
+
+    for lag in [-10, -4, -1, 0, 1, 3, 7, 10]:
+        expected = x.corr(y.shift(-lag))
+        overlap = (x.notna() & y.shift(-lag).notna()).sum()
+        assert result.loc[lag, "correlation"] == pytest.approx(expected, abs=1e-9)
+        assert result.loc[lag, "overlap"] == overlap
+    assert result["correlation"].abs().idxmax() == 3
+
+
+def test_correlation_matrix_matches_dataframe_corr(rng):
+    wide = pd.DataFrame(rng.normal(size=(100, 4)), columns=list("abcd"))
+    wide["b"] += wide["a"]
+    wide.iloc[rng.choice(100, 30, replace=False), 0] = np.nan
+    wide.iloc[rng.choice(100, 20, replace=False), 2] = np.nan
+    wide.iloc[:97, 3] = np.nan  # Only 3 values left for d
+
+    corr, overlap = correlation_matrix(wide, method="pearson", min_periods=4)
+
+    pd.testing.assert_frame_equal(corr, wide.corr(method="pearson", min_periods=4), atol=1e-9)
+    present = wide.notna().astype(int)
+    pd.testing.assert_frame_equal(overlap, present.T @ present)
+
+
+def test_rolling_correlation_matches_window_loop(rng):
+    timestamps = pd.DatetimeIndex(
+        np.sort(pd.Timestamp("2024-01-01", tz="UTC") + pd.to_timedelta(rng.uniform(0, 48, 300), unit="h"))
+    )
+    x = rng.normal(size=300)
+    y = 0.5 * x + rng.normal(size=300)
+
+    result = rolling_correlation(timestamps, x, y, window="6h", step="1h")
+
+    frame = pd.DataFrame({"x": x, "y": y}, index=timestamps)
+    for row in result.itertuples():
+        # Windows are (window_end - window, window_end]
+        in_window = frame[(frame.index > row.window_end - pd.Timedelta("6h")) & (frame.index <= row.window_end)]
+        assert row.count == len(in_window)
+        if len(in_window) >= 3:
+            assert row.correlation == pytest.approx(in_window["x"].corr(in_window["y"]), abs=1e-9)
+        else:
+            assert np.isnan(row.correlation)
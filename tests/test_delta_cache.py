@@ -0,0 +1,176 @@
+"""Checks of the incremental feed cache: fetch planning, merging, derivation, expiry and eviction."""
+
+import threading
+
+import pandas as pd
+import pytest
+
+from utils.delta_cache import DeltaFeedCache, feed_key
+from utils.memory_budget import MemoryBudget
+
+START = pd.Timestamp("2024-01-01", tz="UTC")
+
+
+def feed_rows(first, count, source="reddit", topic="AAPL"):
+    return pd.DataFrame(
+        {
+            "id": [f"{source}-{topic}-{i}" for i in range(first, first + count)],
+            "created_timestamp": [START + pd.Timedelta(minutes=i) for i in range(first, first + count)],
+            "source": source,
+            "topic": topic,
+            "feature_name": "price",
+            "feature_value": [str(i) for i in range(first, first + count)],
+        }
+    )
+
+
+@pytest.fixture
+def key():
+    return feed_key({"universe_name": "U1"})
+
+
+def test_plan_is_full_without_a_base_frame_then_incremental(key):
+    cache = DeltaFeedCache()
+
+    assert cache.plan(key) == (None, False)
+
+    cache.merge(key, feed_rows(0, 10))
+
+    since, incremental = cache.plan(key)
+    assert incremental
+    assert since == START + pd.Timedelta(minutes=9)
+
+
+def test_plan_refetches_fully_when_the_base_is_old_or_does_not_cover_start(key):
+    cache = DeltaFeedCache(full_refresh_seconds=0)
+    cache.merge(key, feed_rows(0, 10))
+
+    assert cache.plan(key) == (None, False)
+
+    cache = DeltaFeedCache()
+    covered_from = START + pd.Timedelta(minutes=5)
+    cache.merge(key, feed_rows(5, 5), start=covered_from)
+
+    assert cache.plan(key, start=START) == (START, False)
+    assert cache.plan(key, start=covered_from + pd.Timedelta(minutes=1))[1]
+
+
+def test_incremental_merge_appends_only_new_rows_in_order(key):
+    cache = DeltaFeedCache()
+    cache.merge(key, feed_rows(0, 10))
+    since, _ = cache.plan(key)
+
+    # The backend may resend rows at or before since, and unsorted
+    response = pd.concat([feed_rows(12, 3), feed_rows(8, 4)]).iloc[::-1]
+    result = cache.merge(key, response, since=since, incremental=True)
+
+    assert list(result["id"]) == [f"reddit-AAPL-{i}" for i in range(15)]
+    assert result["created_timestamp"].is_monotonic_increasing
+    assert cache.frame(key) is not None and len(cache.frame(key)) == 15
+
+
+def test_incremental_merge_without_base_frame_returns_none(key):
+    cache = DeltaFeedCache()
+
+    assert cache.merge(key, feed_rows(0, 3), since=START, incremental=True) is None
+
+
+def test_cached_rows_are_sliced_from_start(key):
+    cache = DeltaFeedCache()
+    cache.merge(key, feed_rows(0, 10))
+
+    rows, age = cache.cached_rows(key, start=START + pd.Timedelta(minutes=7))
+
+    assert list(rows["id"]) == ["reddit-AAPL-7", "reddit-AAPL-8", "reddit-AAPL-9"]
+    assert 0 <= age < 60
+
+
+def test_derive_filters_a_frame_with_fewer_filters(key):
+    cache = DeltaFeedCache()
+    cache.merge(key, pd.concat([feed_rows(0, 5), feed_rows(0, 5, source="gnews")]))
+    narrow = feed_key({"universe_name": "U1", "source": "gnews"})
+
+    df, candidate, age = cache.derive(narrow, max_age=60)
+
+    assert candidate == key
+    assert set(df["source"]) == {"gnews"}
+    assert len(df) == 5
+    assert cache.derive(narrow, max_age=0) is None
+
+
+def test_expire_only_marks_frames_in_scope(key):
+    cache = DeltaFeedCache()
+    other = feed_key({"universe_name": "U2"})
+    unfiltered = feed_key({})
+    for k in (key, other, unfiltered):
+        cache.merge(k, feed_rows(0, 3))
+
+    # An unfiltered frame also holds U1's rows, so it is in scope as well
+    assert cache.expire(universe_name="U1") == 2
+
+    assert cache.cached_rows(key)[1] > 60
+    assert cache.cached_rows(unfiltered)[1] > 60
+    assert cache.cached_rows(other)[1] < 60
+    assert cache.frame(key) is not None
+
+
+def test_budget_evicts_least_recently_used_frame(key):
+    one_frame = DeltaFeedCache()
+    one_frame.merge(key, feed_rows(0, 100))
+    frame_bytes = one_frame.report()[0]["frame_bytes"]
+
+    budget = MemoryBudget(max_bytes=int(frame_bytes * 2.5))
+    cache = DeltaFeedCache(budget=budget)
+    keys = [feed_key({"universe_name": name}) for name in ("U1", "U2", "U3")]
+    cache.merge(keys[0], feed_rows(0, 100))
+    cache.merge(keys[1], feed_rows(0, 100))
+    cache.frame(keys[0])  # Touch U1, so U2 is the least recently used
+
+    cache.merge(keys[2], feed_rows(0, 100))
+
+    assert cache.has(keys[0]) and cache.has(keys[2])
+    assert not cache.has(keys[1])
+    assert budget.stats()["evictions"] == 1
+
+
+def test_eviction_keeps_an_entry_stored_after_the_evicted_one(key):
+    budget = MemoryBudget(max_bytes=10**9)
+    cache = DeltaFeedCache(budget=budget)
+    cache.merge(key, feed_rows(0, 10))
+    evicted = cache._entries[key]
+
+    # Another thread replaces the entry between the budget picking it and its callback running
+    cache.merge(key, feed_rows(0, 20))
+    cache._evict(key, entry=evicted)
+
+    assert len(cache.frame(key)) == 20
+
+
+def test_concurrent_merges_leave_cache_and_budget_consistent():
+    budget = MemoryBudget(max_bytes=10**9)
+    cache = DeltaFeedCache(budget=budget)
+    keys = [feed_key({"universe_name": f"U{i}"}) for i in range(8)]
+
+    def worker(k):
+        for count in range(1, 20):
+            cache.merge(k, feed_rows(0, count))
+
+    threads = [threading.Thread(target=worker, args=(k,)) for k in keys]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert budget.stats()["entries"] == len(keys)
+    assert budget.stats()["bytes"] == sum(row["frame_bytes"] + row["rollup_bytes"] for row in cache.report())
+
+
+def test_invalidate_releases_budget(key):
+    budget = MemoryBudget(max_bytes=10**9)
+    cache = DeltaFeedCache(budget=budget)
+    cache.merge(key, feed_rows(0, 10))
+
+    cache.invalidate()
+
+    assert not cache.has(key)
+    assert budget.stats()["bytes"] == 0
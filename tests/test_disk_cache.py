@@ -0,0 +1,106 @@
+"""Checks of the on-disk Parquet feed cache: appended segments, freshness, invalidation and eviction."""
+
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from utils.disk_cache import PARQUET_AVAILABLE, FeedDiskCache
+
+pytestmark = pytest.mark.skipif(not PARQUET_AVAILABLE, reason="pyarrow is not installed")
+
+START = pd.Timestamp("2024-01-01", tz="UTC")
+
+
+def feed_rows(first, count):
+    return pd.DataFrame(
+        {
+            "id": [str(i) for i in range(first, first + count)],
+            "created_timestamp": [START + pd.Timedelta(minutes=i) for i in range(first, first + count)],
+            "feature_value": [str(i) for i in range(first, first + count)],
+        }
+    )
+
+
+def make_cache(tmp_path, **options):
+    settings = {"ttl_seconds": 60, "max_age_seconds": 3600, "max_bytes": 10**9, "max_segments": 2}
+    settings.update(options)
+    return FeedDiskCache(directory=str(tmp_path), **settings)
+
+
+def latest(df):
+    return df["created_timestamp"].max()
+
+
+def test_store_and_load_round_trip(tmp_path):
+    cache = make_cache(tmp_path)
+    key = (("universe_name", "U1"),)
+
+    assert cache.load(key) == (None, None, False)
+
+    cache.store(key, feed_rows(0, 5), {"covered_from": None})
+    df, meta, fresh = cache.load(key)
+
+    assert list(df["id"]) == ["0", "1", "2", "3", "4"]
+    assert meta == {"covered_from": None}
+    assert fresh
+    assert not make_cache(tmp_path, ttl_seconds=0).load(key)[2]
+
+
+def test_append_adds_segments_until_max_segments(tmp_path):
+    cache = make_cache(tmp_path)
+    key = (("universe_name", "U1"),)
+    assert not cache.append(key, feed_rows(0, 5), START)  # No base file yet
+
+    base = feed_rows(0, 5)
+    cache.store(key, base, {})
+    first = feed_rows(5, 3)
+    assert cache.append(key, first, latest(base))
+    # A segment overlapping rows already stored only contributes the newer ones
+    assert cache.append(key, feed_rows(6, 4), latest(first))
+
+    df, _, _ = cache.load(key)
+    assert list(df["id"]) == [str(i) for i in range(10)]
+
+    assert not cache.append(key, feed_rows(10, 1), START + pd.Timedelta(minutes=9))
+    cache.store(key, df, {})
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_invalidate_removes_a_key_with_its_segments(tmp_path):
+    cache = make_cache(tmp_path)
+    kept, dropped = (("universe_name", "U1"),), (("universe_name", "U2"),)
+    for key in (kept, dropped):
+        cache.store(key, feed_rows(0, 3), {})
+        cache.append(key, feed_rows(3, 2), START + pd.Timedelta(minutes=2))
+
+    cache.invalidate(dropped)
+
+    assert cache.load(dropped)[0] is None
+    assert len(cache.load(kept)[0]) == 5
+    assert len(os.listdir(tmp_path)) == 2
+
+    cache.invalidate()
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_evict_drops_expired_and_least_recently_refreshed_frames(tmp_path):
+    cache = make_cache(tmp_path)
+    keys = [(("universe_name", name),) for name in ("U1", "U2", "U3")]
+    for key in keys:
+        cache.store(key, feed_rows(0, 50), {})
+        cache.append(key, feed_rows(50, 5), START + pd.Timedelta(minutes=49))
+    now = time.time()
+    os.utime(cache._path(keys[0]), (now - 7200, now - 7200))  # Past max_age_seconds
+    os.utime(cache._path(keys[1]), (now - 60, now - 60))
+
+    frame_size = sum(entry.stat().st_size for entry in os.scandir(tmp_path)) // 3
+    cache.max_bytes = frame_size + frame_size // 2
+    cache.evict()
+
+    assert cache.load(keys[0])[0] is None
+    assert cache.load(keys[1])[0] is None
+    assert len(cache.load(keys[2])[0]) == 55
+    assert all(name.startswith(cache._digest(keys[2])) for name in os.listdir(tmp_path))
@@ -0,0 +1,45 @@
+"""Checks that downsampling stays within its point budget and keeps the global extremes."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.downsample import downsample_frame, downsample_indices
+
+
+@pytest.mark.parametrize("n, n_out", [(300, 100), (10_000, 200), (50_000, 64)])
+def test_downsample_indices_keeps_global_extremes(n, n_out):
+    rng = np.random.default_rng(n)
+    x = np.arange(n, dtype=np.float64)
+    y = np.cumsum(rng.normal(size=n))
+    # Isolated spikes in an otherwise smooth stretch are what LTTB tends to drop
+    y[n // 3] = y.max() + 50.0
+    y[n // 3 + 1] = y.min() - 50.0
+
+    indices = downsample_indices(x, y, n_out)
+
+    assert len(indices) <= n_out
+    assert np.all(np.diff(indices) > 0)
+    assert np.argmax(y) in indices
+    assert np.argmin(y) in indices
+
+
+def test_downsample_frame_limits_each_group():
+    n = 5_000
+    times = pd.date_range("2024-01-01", periods=n, freq="1min", tz="UTC")
+    df = pd.DataFrame(
+        {
+            "created_timestamp": np.tile(times, 2),
+            "feature_numeric": np.concatenate([np.sin(np.arange(n) / 50.0), np.arange(n, dtype=np.float64)]),
+            "feature_name": np.repeat(["a", "b"], n),
+        }
+    )
+
+    result = downsample_frame(df, "created_timestamp", "feature_numeric", 100, group_col="feature_name")
+
+    counts = result["feature_name"].value_counts()
+    assert (counts <= 100).all()
+    for _, group in result.groupby("feature_name"):
+        source = df[df["feature_name"] == group["feature_name"].iloc[0]]
+        assert group["feature_numeric"].max() == source["feature_numeric"].max()
+        assert group["feature_numeric"].min() == source["feature_numeric"].min()
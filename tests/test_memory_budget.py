@@ -0,0 +1,61 @@
+"""Checks of the shared memory budget's least-recently-used eviction across caches."""
+
+import numpy as np
+import pandas as pd
+
+from utils.memory_budget import MemoryBudget, nbytes
+
+
+class Owner:
+    def __init__(self):
+        self.evicted = []
+
+    def evict(self, key):
+        self.evicted.append(key)
+
+
+def test_evicts_least_recently_used_across_owners():
+    budget = MemoryBudget(max_bytes=300)
+    a, b = Owner(), Owner()
+    budget.add(a, "a1", 100, a.evict)
+    budget.add(b, "b1", 100, b.evict)
+    budget.add(a, "a2", 100, a.evict)
+    budget.touch(a, "a1")
+
+    budget.add(b, "b2", 100, b.evict)
+
+    assert b.evicted == ["b1"]
+    assert a.evicted == []
+    assert budget.stats() == {"bytes": 300, "max_bytes": 300, "entries": 3, "evictions": 1}
+
+
+def test_same_key_of_different_owners_is_tracked_separately():
+    budget = MemoryBudget(max_bytes=1000)
+    a, b = Owner(), Owner()
+    budget.add(a, "key", 100, a.evict)
+    budget.add(b, "key", 200, b.evict)
+
+    budget.add(a, "key", 50, a.evict)  # Resizes a's entry only
+    budget.remove(b, "key")
+
+    assert budget.stats()["bytes"] == 50
+    assert budget.stats()["entries"] == 1
+
+
+def test_entry_just_added_is_never_evicted():
+    budget = MemoryBudget(max_bytes=100)
+    owner = Owner()
+    budget.add(owner, "small", 50, owner.evict)
+
+    budget.add(owner, "large", 500, owner.evict)
+
+    assert owner.evicted == ["small"]
+    assert budget.stats()["bytes"] == 500
+
+
+def test_nbytes_counts_frames_in_tuples():
+    df = pd.DataFrame({"value": np.arange(1000, dtype=np.int64)})
+
+    assert nbytes(df) >= 8000
+    assert nbytes((df, "label", df)) == 2 * nbytes(df)
+    assert nbytes(None) == 0
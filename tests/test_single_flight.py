@@ -0,0 +1,85 @@
+"""Checks that SingleFlight runs concurrent identical calls once and shares the outcome."""
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from utils.api_client import SingleFlight
+
+
+def run_concurrently(count, target):
+    results, errors = [None] * count, [None] * count
+
+    def worker(i):
+        try:
+            results[i] = target()
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def wait_for_calls(flight, count, timeout=5.0):
+    # Let every caller join the leader's call before it finishes
+    deadline = time.time() + timeout
+    while sum(flight.stats().get("fetch", {}).values()) < count:
+        assert time.time() < deadline, "callers did not arrive in time"
+        time.sleep(0.001)
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    executions = []
+
+    def fetch():
+        executions.append(1)
+        release.wait(5)
+        return pd.DataFrame({"value": [1, 2, 3]})
+
+    threads, results, errors = run_concurrently(4, lambda: flight.do("fetch", ("U1",), fetch))
+    wait_for_calls(flight, 4)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(executions) == 1
+    assert errors == [None] * 4
+    assert flight.stats() == {"fetch": {"executed": 1, "coalesced": 3}}
+    # Followers get their own copies, so modifying one result leaves the others intact
+    results[0].loc[0, "value"] = -1
+    assert sum(result.loc[0, "value"] == 1 for result in results) == 3
+
+
+def test_followers_receive_the_leaders_exception():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fetch():
+        release.wait(5)
+        raise RuntimeError("backend down")
+
+    threads, _, errors = run_concurrently(3, lambda: flight.do("fetch", ("U1",), fetch))
+    wait_for_calls(flight, 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert all(isinstance(error, RuntimeError) for error in errors)
+
+
+def test_different_keys_and_later_calls_execute_again():
+    flight = SingleFlight()
+
+    assert flight.do("fetch", ("U1",), lambda: 1) == 1
+    assert flight.do("fetch", ("U2",), lambda: 2) == 2
+    assert flight.do("fetch", ("U1",), lambda: 3) == 3
+    assert flight.stats() == {"fetch": {"executed": 3, "coalesced": 0}}
+
+    with pytest.raises(ValueError):
+        flight.do("fetch", ("U1",), lambda: int("not a number"))
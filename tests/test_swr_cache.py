@@ -0,0 +1,115 @@
+"""Checks of stale-while-revalidate caching, scoped invalidation and budget accounting."""
+
+import time
+
+import pandas as pd
+import pytest
+
+from utils.memory_budget import MemoryBudget
+from utils.swr_cache import SWRCache, in_scope
+
+
+class Backend:
+    def __init__(self):
+        self.calls = []
+
+    def get_feed(self, universe_name=None, source=None):
+        self.calls.append((universe_name, source))
+        return pd.DataFrame({"universe_name": [universe_name], "source": [source], "call": [len(self.calls)]})
+
+
+def make_cache(backend, **options):
+    settings = {"ttl": 60, "max_stale": 120, "max_entries": 16, "fallback": None, "namespace": "feed"}
+    settings.update(options)
+    return SWRCache(backend.get_feed, **settings)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.01)
+
+
+def test_positional_and_keyword_calls_share_an_entry_and_get_copies():
+    backend = Backend()
+    cache = make_cache(backend)
+
+    first = cache("U1")
+    first.loc[0, "call"] = -1
+    second = cache(universe_name="U1", source=None)
+
+    assert backend.calls == [("U1", None)]
+    assert second.loc[0, "call"] == 1
+
+
+def test_stale_value_is_served_while_refreshing():
+    backend = Backend()
+    cache = make_cache(backend, ttl=0)
+    cache("U1")
+
+    stale = cache("U1")
+
+    assert stale.loc[0, "call"] == 1
+    # The background refresh replaces the value served to later calls
+    wait_for(lambda: cache("U1").loc[0, "call"] >= 2)
+
+
+def test_failure_returns_a_copy_of_the_fallback_and_caches_nothing():
+    def failing(universe_name=None):
+        raise RuntimeError("backend down")
+
+    cache = SWRCache(failing, 60, 120, 16, fallback=[], namespace="feed")
+
+    result = cache("U1")
+    result.append("modified")
+
+    assert cache("U1") == []
+    assert not cache._entries
+
+
+def test_invalidate_drops_only_entries_in_scope():
+    backend = Backend()
+    cache = make_cache(backend)
+    cache("U1", "reddit")
+    cache("U1", "gnews")
+    cache("U2", "reddit")
+    cache()  # Unfiltered, so in scope of every universe and source
+
+    assert cache.invalidate(universe_name="U1", source="reddit") == 2
+
+    calls = len(backend.calls)
+    cache("U1", "gnews")
+    cache("U2", "reddit")
+    assert len(backend.calls) == calls
+    cache("U1", "reddit")
+    cache()
+    assert len(backend.calls) == calls + 2
+
+
+@pytest.mark.parametrize(
+    "arguments, expected",
+    [
+        ({"universe_name": "U1", "source": "reddit"}, True),
+        ({"universe_name": "U1", "source": None}, True),
+        ({"universe_name": "U2", "source": "reddit"}, False),
+    ],
+)
+def test_in_scope(arguments, expected):
+    assert in_scope(arguments, {"universe_name": "U1"}) is expected
+
+
+def test_entries_are_released_from_the_budget():
+    backend = Backend()
+    budget = MemoryBudget(max_bytes=10**9)
+    cache = make_cache(backend, max_entries=2, budget=budget)
+    cache("U1")
+    cache("U2")
+    cache("U3")  # Over max_entries, so U1 is dropped
+
+    assert budget.stats()["entries"] == 2
+
+    cache.clear()
+
+    assert budget.stats() == {"bytes": 0, "max_bytes": 10**9, "entries": 0, "evictions": 0}
@@ -5,14 +5,16 @@ import pandas as pd
 from utils.api_client import APIClient
 
 
-def display_alpha_source(universe):
+def display_alpha_source(universe, feed_result=None):
     if not universe:
         st.warning("No universe selected.")
         return
 
     # Pass the universe directly
-    with st.spinner(f"Fetching news for {len(universe.get('topics'))} topic(s)..."):
-        universe_feeds, overall_sentiment_average = APIClient.create_alpha_feed(universe)
+    if feed_result is None:
+        with st.spinner(f"Fetching news for {len(universe.get('topics'))} topic(s)..."):
+            feed_result = APIClient.create_alpha_feed(universe)
+    universe_feeds, overall_sentiment_average = feed_result
 
     print(f"ALPHA source data summary: {len(universe_feeds)} topics processed")
 
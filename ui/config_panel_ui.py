@@ -1,7 +1,10 @@
 """Configuration panel for the Reddit Sentiment Analysis app."""
 
+import pandas as pd
 import streamlit as st
 from utils.api_client import APIClient
+from utils import perf
+from utils.memory_budget import memory_report
 from config import API_BASE_URL
 # from datetime import datetime
 
@@ -52,9 +55,85 @@ def configure_settings():
     # Add dark mode toggle
     dark_mode = st.sidebar.checkbox("Dark Mode", value=False)
 
+    # Read by display_performance_panel, which runs after the page
+    st.sidebar.checkbox("Performance Panel", value=False, key="show_performance_panel")
+
     return dark_mode
 
 
+def display_performance_panel():
+    """
+    Display the request/render latency and cache counters recorded by utils.perf.
+
+    Only rendered when enabled in the app settings. Call it after the page so it
+    includes the measurements of the current rerun.
+    """
+    if not st.session_state.get("show_performance_panel"):
+        return
+
+    with st.sidebar.expander("Performance", expanded=True):
+        memory = APIClient.get_memory_stats()
+        st.caption(
+            f"Feed cache memory: {memory['bytes'] / 1024**2:.1f} / {memory['max_bytes'] / 1024**2:.0f} MiB "
+            f"in {memory['entries']} frames, {memory['evictions']} evicted"
+        )
+        display_feed_memory_report()
+
+        snapshot = perf.snapshot()
+        timers, counters = snapshot["timers"], snapshot["counters"]
+        if not timers and not counters:
+            st.caption("No measurements yet.")
+            return
+
+        if timers:
+            st.markdown("**Latency (ms)**")
+            summary = pd.DataFrame(
+                [{k: v for k, v in stats.items() if k != "histogram"} for stats in timers.values()],
+                index=list(timers),
+            )
+            st.dataframe(summary.round(1), use_container_width=True)
+
+            selected = st.selectbox("Histogram", list(timers), key="perf_histogram_timer")
+            histogram = pd.Series(timers[selected]["histogram"], name="count")
+            st.bar_chart(histogram[histogram.cumsum() > 0])  # Skip empty leading buckets
+
+        if counters:
+            st.markdown("**Cache outcomes**")
+            st.dataframe(pd.DataFrame(counters).T.fillna(0).astype(int), use_container_width=True)
+
+        # Serializing every recent event is only worth it when asked for
+        if st.button("Prepare JSON export", key="perf_export", use_container_width=True):
+            st.download_button(
+                "Download JSON",
+                perf.export_json(),
+                file_name="sotw_perf.json",
+                mime="application/json",
+                use_container_width=True,
+            )
+        if st.button("Reset", key="perf_reset", use_container_width=True):
+            perf.reset()
+            st.rerun()
+
+
+def display_feed_memory_report():
+    """Display the size of each cached feed frame and, on request, a per-column breakdown of one of them."""
+    frames = APIClient.get_memory_report()
+    if not frames:
+        return
+    st.markdown("**Cached feed frames**")
+    table = pd.DataFrame([{k: v for k, v in frame.items() if k != "frame"} for frame in frames]).set_index("key")
+    table[["frame_bytes", "rollup_bytes"]] = (table[["frame_bytes", "rollup_bytes"]] / 1024**2).round(2)
+    st.dataframe(table.rename(columns={"frame_bytes": "frame MiB", "rollup_bytes": "rollups MiB"}))
+
+    # The breakdown measures every column of the frame, so it is computed only while shown
+    if not st.checkbox("Column breakdown", key="perf_memory_columns"):
+        return
+    selected = st.selectbox("Columns of", list(table.index), key="perf_memory_frame")
+    report = memory_report(next(frame["frame"] for frame in frames if frame["key"] == selected))
+    report["bytes"] = (report["bytes"] / 1024**2).round(3)
+    st.dataframe(report.rename(columns={"bytes": "MiB"}).style.format({"share": "{:.0%}"}))
+
+
 def display_top_news_sidebar():
     """Display top news in the sidebar."""
     st.sidebar.markdown("---")
@@ -5,18 +5,68 @@ import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from utils.api_client import APIClient
-from utils.general_utils import filter_dataframe_by_time, TIME_WINDOW_OPTIONS, TIME_WINDOW_DAY
+from utils import perf
+from utils.correlation_utils import (
+    align_feeds_to_grid,
+    best_lag,
+    correlation_matrix,
+    lagged_cross_correlation,
+    resample_feed,
+    rolling_correlation,
+    top_correlated_pairs,
+)
+from utils.feed_store import get_feed_store
+from utils.feed_catalog import get_feed_catalog
+from utils.feed_ingest import numeric_feature_values
+from utils.plot_utils import (
+    create_correlation_heatmap,
+    create_lag_correlation_plot,
+    create_rolling_correlation_plot,
+)
+from utils.general_utils import get_time_window_start, get_time_window_fetch_start, TIME_WINDOW_OPTIONS, TIME_WINDOW_DAY
+from config import CORRELATION_ROLLUP_MIN_POINTS
+
+
+MODE_PAIR = "Feed pair"
+MODE_MATRIX = "Universe matrix"
+
+GRID_FREQUENCIES = {"5 minutes": "5min", "15 minutes": "15min", "1 hour": "1h", "1 day": "1D"}
+ROLLING_WINDOWS = {
+    "1 hour": pd.Timedelta(hours=1),
+    "1 day": pd.Timedelta(days=1),
+    "7 days": pd.Timedelta(days=7),
+    "30 days": pd.Timedelta(days=30),
+}
+ROLLING_STEPS = {
+    "1 minute": pd.Timedelta(minutes=1),
+    "15 minutes": pd.Timedelta(minutes=15),
+    "1 hour": pd.Timedelta(hours=1),
+    "1 day": pd.Timedelta(days=1),
+}
+MAX_LAGS = {
+    "1 hour": pd.Timedelta(hours=1),
+    "6 hours": pd.Timedelta(hours=6),
+    "1 day": pd.Timedelta(days=1),
+    "7 days": pd.Timedelta(days=7),
+    "30 days": pd.Timedelta(days=30),
+}
 
 
 def display_correlation_finder():
     st.title("📊 Correlation Finder")
-    st.write("Select two data feeds to analyze their correlation.")
 
     universes = APIClient.get_all_universes()
     if not universes:
         st.warning("No universes available.")
         return
 
+    mode = st.radio("Mode:", [MODE_PAIR, MODE_MATRIX], horizontal=True, key="correlation_mode")
+    if mode == MODE_MATRIX:
+        display_correlation_matrix(universes)
+        return
+
+    st.write("Select two data feeds to analyze their correlation.")
+
     col1, col2 = st.columns(2)
 
     with col1:
@@ -34,8 +84,6 @@ def display_correlation_finder():
     def on_correlation_time_change():
         # Get the value directly from the widget key
         st.session_state.correlation_time_window = st.session_state.correlation_time_selector
-        # Force a refresh of data
-        st.cache_data.clear()
 
     # Use selectbox with on_change callback
     st.selectbox(
@@ -49,42 +97,132 @@ def display_correlation_finder():
     # Get time window from session state
     time_window = st.session_state.correlation_time_window
 
+    show_rolling = st.checkbox("Rolling correlation", key="correlation_show_rolling")
+    if show_rolling:
+        rolling_col1, rolling_col2 = st.columns(2)
+        rolling_window_label = rolling_col1.selectbox(
+            "Rolling Window:", list(ROLLING_WINDOWS.keys()), index=1, key="rolling_window"
+        )
+        rolling_step_label = rolling_col2.selectbox(
+            "Rolling Step:", list(ROLLING_STEPS.keys()), index=2, key="rolling_step"
+        )
+
+    scan_lags = st.checkbox("Scan lead/lag", key="correlation_scan_lags")
+    if scan_lags:
+        lag_col1, lag_col2 = st.columns(2)
+        lag_grid_label = lag_col1.selectbox("Time Grid:", list(GRID_FREQUENCIES.keys()), index=2, key="lag_grid")
+        max_lag_label = lag_col2.selectbox("Max Lag:", list(MAX_LAGS.keys()), index=3, key="lag_max")
+
     if st.button("Generate Correlation Plot", type="primary", use_container_width=True):
         if feed1 and feed2:
             with st.spinner("Generating plot..."):
                 # Use timestamp to ensure unique keys for plots
                 timestamp = pd.Timestamp.now().isoformat()
-                df1, df2 = get_correlation_data(feed1, feed2, time_window)
+                # Rollup buckets must stay finer than the rolling step and the lag grid
+                resolutions = []
+                if show_rolling:
+                    resolutions.append(ROLLING_STEPS[rolling_step_label])
+                if scan_lags:
+                    resolutions.append(pd.Timedelta(GRID_FREQUENCIES[lag_grid_label]))
+                df1, df2 = get_correlation_data(
+                    feed1, feed2, time_window, max_frequency=min(resolutions) if resolutions else None
+                )
                 if df1 is not None and df2 is not None:
                     fig = create_dual_axis_plot(feed1, feed2, df1, df2)
+                    if scan_lags:
+                        lag_fig, best = calculate_lagged_correlation(
+                            df1, df2, GRID_FREQUENCIES[lag_grid_label], MAX_LAGS[max_lag_label]
+                        )
                     corr_value = calculate_correlation(df1, df2)
                     if corr_value is not None:
                         st.metric("Spearman Correlation Coefficient", f"{corr_value:.4f}")
-                    st.plotly_chart(fig, use_container_width=True, key=f"corr_plot_{timestamp}")
-                    
+                    perf.plotly_chart(fig, use_container_width=True, key=f"corr_plot_{timestamp}")
+
+                    if show_rolling:
+                        rolling_fig = calculate_rolling_correlation(
+                            df1,
+                            df2,
+                            ROLLING_WINDOWS[rolling_window_label],
+                            ROLLING_STEPS[rolling_step_label],
+                        )
+                        if rolling_fig is not None:
+                            perf.plotly_chart(rolling_fig, use_container_width=True, key=f"rolling_plot_{timestamp}")
+                        else:
+                            st.warning("Not enough overlapping data for a rolling correlation.")
+
+                    if scan_lags:
+                        if best is not None:
+                            st.metric(
+                                "Best Lag (positive: feed 1 leads feed 2)",
+                                f"{best['lag_timedelta'].total_seconds() / 3600:+g} h",
+                                f"correlation {best['correlation']:.4f}",
+                                delta_color="off",
+                            )
+                            perf.plotly_chart(lag_fig, use_container_width=True, key=f"lag_plot_{timestamp}")
+                        else:
+                            st.warning("Not enough overlapping data to scan lags.")
                 else:
                     st.warning("Unable to generate plot. Check data availability.")
         else:
             st.warning("Select two complete feeds.")
 
 
+def display_correlation_matrix(universes):
+    st.write("Correlate every numeric feed of a universe against every other one.")
+
+    col1, col2, col3, col4 = st.columns(4)
+    selected_universe = col1.selectbox("Universe:", [u["universe_name"] for u in universes], key="matrix_universe")
+    time_window = col2.selectbox(
+        "Time Window:", TIME_WINDOW_OPTIONS, index=TIME_WINDOW_OPTIONS.index(TIME_WINDOW_DAY), key="matrix_time_window"
+    )
+    grid_label = col3.selectbox("Time Grid:", list(GRID_FREQUENCIES.keys()), index=2, key="matrix_grid")
+    method = col4.selectbox("Method:", ["spearman", "pearson"], key="matrix_method")
+    top_k = st.slider("Strongest pairs to list:", min_value=5, max_value=100, value=20, key="matrix_top_k")
+
+    if not st.button("Compute Correlation Matrix", type="primary", use_container_width=True):
+        return
+
+    with st.spinner("Computing correlation matrix..."):
+        start = get_time_window_start(time_window)
+        grid = GRID_FREQUENCIES[grid_label]
+        store = get_feed_store(selected_universe, since=get_time_window_fetch_start(time_window))
+        # Rollup buckets no coarser than the grid fit in it exactly, so they can replace raw rows
+        rollup_frequency = store.rollup_frequency(start=start, max_frequency=grid)
+        if rollup_frequency is not None:
+            df = store.rollup_slice(rollup_frequency, start=start)
+        else:
+            df = store.slice(start=start)
+        wide = align_feeds_to_grid(df, grid)
+        if wide.shape[1] < 2:
+            st.warning("Not enough numeric feeds in this time window to correlate.")
+            return
+        corr, overlap = correlation_matrix(wide, method=method)
+
+    st.caption(f"{wide.shape[1]} feeds aligned on {len(wide)} time buckets")
+    st.subheader("Strongest Pairs")
+    st.dataframe(top_correlated_pairs(corr, overlap, k=top_k), use_container_width=True)
+    perf.plotly_chart(
+        create_correlation_heatmap(corr, f"{selected_universe} {method.capitalize()} Correlation Matrix"),
+        use_container_width=True,
+        key=f"corr_matrix_{selected_universe}_{time_window}_{grid_label}_{method}",
+    )
+
+
 def select_feed(index, universes):
     prefix = f"feed{index}_"
 
     selected_universe = st.selectbox("Universe:", [u["universe_name"] for u in universes], key=f"{prefix}universe")
 
-    feed_data = APIClient.get_feed_from_db(universe_name=selected_universe)
-    if feed_data.empty:
+    catalog = get_feed_catalog(selected_universe)
+    if catalog.empty:
         st.warning(f"No data for universe {selected_universe}")
         return None
 
-    selected_topic = st.selectbox("Topic:", feed_data["topic"].unique(), key=f"{prefix}topic")
-    topic_data = feed_data[feed_data["topic"] == selected_topic]
-
-    selected_source = st.selectbox("Source:", topic_data["source"].unique(), key=f"{prefix}source")
-    source_data = topic_data[topic_data["source"] == selected_source]
-
-    selected_feature = st.selectbox("Feature:", source_data["feature_name"].unique(), key=f"{prefix}feature")
+    selected_topic = st.selectbox("Topic:", catalog.topics(), key=f"{prefix}topic")
+    selected_source = st.selectbox("Source:", catalog.sources(topic=selected_topic), key=f"{prefix}source")
+    selected_feature = st.selectbox(
+        "Feature:", catalog.features(source=selected_source, topic=selected_topic), key=f"{prefix}feature"
+    )
 
     return {
         "universe_name": selected_universe,
@@ -95,22 +233,46 @@ def select_feed(index, universes):
     }
 
 
-def get_correlation_data(feed1, feed2, time_window):
-    # Create copies of feed dictionaries without display_name
-    feed1_params = {k: v for k, v in feed1.items() if k != "display_name"}
-    feed2_params = {k: v for k, v in feed2.items() if k != "display_name"}
-
-    df1 = APIClient.get_feed_from_db(**feed1_params)
-    df2 = APIClient.get_feed_from_db(**feed2_params)
-
-    df1 = filter_dataframe_by_time(df1, time_window)
-    df2 = filter_dataframe_by_time(df2, time_window)
+def get_correlation_data(feed1, feed2, time_window, max_frequency=None):
+    """
+    Load both feeds for the time window.
+
+    Long windows read the bucket means of a common rollup that still leaves
+    CORRELATION_ROLLUP_MIN_POINTS buckets (and is no coarser than max_frequency).
+    """
+    start = get_time_window_start(time_window)
+    fetch_start = get_time_window_fetch_start(time_window)
+    stores = [get_feed_store(feed["universe_name"], since=fetch_start) for feed in (feed1, feed2)]
+    frequencies = [
+        store.rollup_frequency(
+            source=feed["source"],
+            topic=feed["topic"],
+            feature_name=feed["feature_name"],
+            start=start,
+            min_points=CORRELATION_ROLLUP_MIN_POINTS,
+            max_frequency=max_frequency,
+        )
+        for store, feed in zip(stores, (feed1, feed2))
+    ]
+    # Both feeds must use the same buckets to line up; take the finer of the two choices
+    rollup_frequency = None
+    if None not in frequencies:
+        rollup_frequency = min(frequencies, key=pd.Timedelta)
+
+    df1, df2 = (
+        store.rollup_slice(
+            rollup_frequency, source=feed["source"], topic=feed["topic"], feature_name=feed["feature_name"], start=start
+        )
+        if rollup_frequency is not None
+        else store.slice(source=feed["source"], topic=feed["topic"], feature_name=feed["feature_name"], start=start)
+        for store, feed in zip(stores, (feed1, feed2))
+    )
 
     if df1.empty or df2.empty:
         return None, None
 
-    df1["feature_value"] = pd.to_numeric(df1["feature_value"], errors="coerce")
-    df2["feature_value"] = pd.to_numeric(df2["feature_value"], errors="coerce")
+    df1["feature_value"] = numeric_feature_values(df1)
+    df2["feature_value"] = numeric_feature_values(df2)
 
     df1.dropna(inplace=True)
     df2.dropna(inplace=True)
@@ -146,24 +308,37 @@ def create_dual_axis_plot(feed1, feed2, df1, df2):
     return fig
 
 
-def calculate_correlation(df1, df2):
-    # Convert timestamps to datetime
-    df1['created_timestamp'] = pd.to_datetime(df1['created_timestamp'])
-    df2['created_timestamp'] = pd.to_datetime(df2['created_timestamp'])
+def calculate_lagged_correlation(df1, df2, freq, max_lag):
+    """Scan the cross-correlation of two feeds over +/- max_lag; returns (figure, best lag row or None)."""
+    series1 = resample_feed(df1, freq)
+    series2 = resample_feed(df2, freq)
+    if series1.empty or series2.empty:
+        return None, None
+
+    lag_correlations = lagged_cross_correlation(series1, series2, freq, int(max_lag / pd.Timedelta(freq)))
+    best = best_lag(lag_correlations)
+    return create_lag_correlation_plot(lag_correlations, best), best
+
 
-    # Set timestamp as index
-    df1.set_index('created_timestamp', inplace=True)
-    df2.set_index('created_timestamp', inplace=True)
+def align_feed_pair(df1, df2):
+    """Align feed 2 onto the timestamps of feed 1 (nearest value within a minute), without modifying either."""
+    # Use the (already parsed, UTC) timestamps as index
+    series1 = pd.Series(df1["feature_value"].to_numpy(), index=pd.DatetimeIndex(df1["created_timestamp"]))
+    series2 = pd.Series(df2["feature_value"].to_numpy(), index=pd.DatetimeIndex(df2["created_timestamp"]))
 
     # Reindex df2 to timestamps of df1, interpolating values to match closely
-    df2_aligned = df2.reindex(df1.index, method='nearest', tolerance=pd.Timedelta('1min'))
+    series2_aligned = series2.reindex(series1.index, method='nearest', tolerance=pd.Timedelta('1min'))
 
     # Combine into single DataFrame
-    combined = pd.DataFrame({
-        "feature_value_1": df1["feature_value"],
-        "feature_value_2": df2_aligned["feature_value"]
+    return pd.DataFrame({
+        "feature_value_1": series1,
+        "feature_value_2": series2_aligned
     }).dropna()
 
+
+def calculate_correlation(df1, df2):
+    combined = align_feed_pair(df1, df2)
+
     if len(combined) < 2:
         return None
 
@@ -171,3 +346,20 @@ def calculate_correlation(df1, df2):
     return combined["feature_value_1"].corr(combined["feature_value_2"], method='spearman')
 
 
+def calculate_rolling_correlation(df1, df2, window, step):
+    """Compute the rolling rank (Spearman) correlation of two feeds; returns a figure or None."""
+    combined = align_feed_pair(df1, df2)
+    if len(combined) < 2:
+        return None
+
+    rolling = rolling_correlation(
+        combined.index,
+        combined["feature_value_1"].to_numpy(),
+        combined["feature_value_2"].to_numpy(),
+        window,
+        step,
+        method="spearman",
+    )
+    if rolling["correlation"].isna().all():
+        return None
+    return create_rolling_correlation_plot(rolling, "Rolling Rank Correlation")
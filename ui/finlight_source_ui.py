@@ -3,14 +3,16 @@ import pandas as pd
 from utils.api_client import APIClient
 
 
-def display_finlight_source(universe):
+def display_finlight_source(universe, feed_result=None):
     if not universe:
         st.warning("No universe selected.")
         return
 
     # Fetch data from API
-    with st.spinner(f"Fetching Finlight data for {len(universe.get('topics', []))} topic(s)..."):
-        universe_feeds, overall_average = APIClient.create_finlight_feed(universe)
+    if feed_result is None:
+        with st.spinner(f"Fetching Finlight data for {len(universe.get('topics', []))} topic(s)..."):
+            feed_result = APIClient.create_finlight_feed(universe)
+    universe_feeds, overall_average = feed_result
 
     print(f"FINLIGHT data summary: {len(universe_feeds)} topics analyzed.")
 
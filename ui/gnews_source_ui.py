@@ -5,13 +5,15 @@ import pandas as pd
 from utils.api_client import APIClient
 
 
-def display_gnews_source(universe):
+def display_gnews_source(universe, feed_result=None):
     if not universe:
         st.warning("No universe selected.")
         return
 
-    with st.spinner(f"Fetching news for {len(universe.get('topics'))} topic(s)..."):
-        universe_feeds, overall_sentiment_average = APIClient.create_gnews_feed(universe)
+    if feed_result is None:
+        with st.spinner(f"Fetching news for {len(universe.get('topics'))} topic(s)..."):
+            feed_result = APIClient.create_gnews_feed(universe)
+    universe_feeds, overall_sentiment_average = feed_result
 
     print(f"GNEWS source data summary: {len(universe_feeds)} topics analyzed")
 
@@ -47,9 +49,11 @@ def display_gnews_source(universe):
 
         sentiment_cols = [ "Vader Sentiment", "Finbert Sentiment"] 
 
+        styler = df.style.format({col: "{:.4f}" for col in sentiment_cols})
+        # Styler.applymap was renamed to Styler.map in pandas 2.1 and removed in pandas 3
+        style_map = styler.map if hasattr(styler, "map") else styler.applymap
         st.write(
-            df.style.format({col: "{:.4f}" for col in sentiment_cols})
-            .applymap(
+            style_map(
                 lambda val: "color: green" if val > 0 else ("color: red" if val < 0 else "color: black"),
                 subset=sentiment_cols,
             )
@@ -3,13 +3,15 @@ import pandas as pd
 from utils.api_client import APIClient
 
 
-def display_meteo_source(universe):
+def display_meteo_source(universe, feed_result=None):
     if not universe:
         st.warning("No universe selected.")
         return
 
-    with st.spinner(f"Fetching air quality data for {len(universe.get('topics'))} location(s)..."):
-        universe_feeds = APIClient.create_meteo_feed(universe)
+    if feed_result is None:
+        with st.spinner(f"Fetching air quality data for {len(universe.get('topics'))} location(s)..."):
+            feed_result = APIClient.create_meteo_feed(universe)
+    universe_feeds = feed_result
 
     print(f"METEO source data summary: {len(universe_feeds)} locations analyzed")
 
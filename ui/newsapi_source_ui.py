@@ -5,14 +5,16 @@ import pandas as pd
 from utils.api_client import APIClient
 
 
-def display_newsapi_source(universe):
+def display_newsapi_source(universe, feed_result=None):
     if not universe:
         st.warning("No universe selected.")
         return
 
     # Fetch news for all topics with UI feedback
-    with st.spinner(f"Fetching news for {len(universe.get('topics'))} topic(s)..."):
-        universe_feeds, overall_sentiment_average = APIClient.create_newsapi_feed(universe)
+    if feed_result is None:
+        with st.spinner(f"Fetching news for {len(universe.get('topics'))} topic(s)..."):
+            feed_result = APIClient.create_newsapi_feed(universe)
+    universe_feeds, overall_sentiment_average = feed_result
 
     print(
         f"NEWSAPI source data summary: {len(universe_feeds)} topics analyzed."
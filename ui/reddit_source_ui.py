@@ -1,8 +1,11 @@
 """Results display module for the Reddit Sentiment Analysis app."""
 
+from datetime import datetime
+
 import streamlit as st
 from utils.plot_utils import create_reddit_source_sentiment_plot, create_reddit_source_topic_plot
 from utils.api_client import APIClient
+from utils import perf
 from config import (
     NEGATIVE_SENTIMENT_THRESHOLD,
     POSITIVE_SENTIMENT_THRESHOLD,
@@ -10,15 +13,22 @@ from config import (
 )
 
 
-def display_reddit_source(universe):
+def display_reddit_source(universe, feed_result=None):
     if not universe:
         st.warning("No universe selected.")
         return
 
-    with st.spinner(f"Scanning REDDIT and analyzing for {universe.get('universe_name')}..."):
-        universe_feeds, overall_sentiment_average = APIClient.create_reddit_feed(universe)
+    if feed_result is None:
+        with st.spinner(f"Scanning REDDIT and analyzing for {universe.get('universe_name')}..."):
+            feed_result = APIClient.create_reddit_feed(universe)
+    universe_feeds, overall_sentiment_average = feed_result
+
+    print(f"REDDIT source data summary: Analyzed {len(universe_feeds)} topics")
 
-        print(f"REDDIT source data summary: Analyzed {len(universe_feeds)} topics")
+    # The backend sends last_timestamp as an ISO string in JSON
+    universe_feeds = [
+        {**feed, "last_timestamp": parse_timestamp(feed.get("last_timestamp"))} for feed in universe_feeds
+    ]
 
     results = {
         "universe_feeds": universe_feeds,
@@ -57,7 +67,7 @@ def display_overall_sentiment(results):
     total_comments = sum(feed["num_comments"] for feed in results["universe_feeds"])
 
     fig = create_reddit_source_sentiment_plot(sentiment_scores, total_submissions, total_comments)
-    st.plotly_chart(fig, use_container_width=True)
+    perf.plotly_chart(fig, use_container_width=True)
 
 
 def display_topic_sentiment(results):
@@ -86,7 +96,7 @@ def display_topic_sentiment(results):
             f"Average Sentiment: <b style='color:{avg_color}'>{avg_sentiment:.3f}</b>",
             unsafe_allow_html=True,
         )
-        st.plotly_chart(figs[topic], use_container_width=True)
+        perf.plotly_chart(figs[topic], use_container_width=True)
 
 
 def display_summary_statistics(results):
@@ -127,6 +137,13 @@ def determine_sentiment_color(score):
     return SENTIMENT_COLORS["neutral"]
 
 
+def parse_timestamp(timestamp):
+    """Return timestamp as a datetime, parsing ISO strings; None stays None."""
+    if isinstance(timestamp, str):
+        return datetime.fromisoformat(timestamp)
+    return timestamp
+
+
 def format_timestamp(timestamp):
     """Format the timestamp for display."""
     if timestamp:
@@ -1,4 +1,8 @@
+import time
+from concurrent.futures import as_completed
+
 import streamlit as st
+from utils.async_api_client import get_async_client, submit
 from ui.reddit_source_ui import display_reddit_source
 from ui.alpha_source_ui import display_alpha_source
 from ui.newsapi_source_ui import display_newsapi_source
@@ -6,27 +10,31 @@ from ui.gnews_source_ui import display_gnews_source
 from ui.finlight_source_ui import display_finlight_source
 from ui.meteo_source_ui import display_meteo_source
 
+FETCH_ALL = "ALL"
+
+# Source name -> (display function, AsyncAPIClient fetch method name)
+SOURCES = {
+    "REDDIT": (display_reddit_source, "create_reddit_feed"),
+    "ALPHA News": (display_alpha_source, "create_alpha_feed"),
+    "NEWSAPI": (display_newsapi_source, "create_newsapi_feed"),
+    "FINLIGHT": (display_finlight_source, "create_finlight_feed"),
+    "GNEWS": (display_gnews_source, "create_gnews_feed"),
+    "METEO": (display_meteo_source, "create_meteo_feed"),
+}
+
+
 def display_source_fetch_buttons(universe):
     st.header("Data Sources")
 
-    sources = {
-        "REDDIT": display_reddit_source,
-        "ALPHA News": display_alpha_source,
-        "NEWSAPI": display_newsapi_source,
-        "FINLIGHT": display_finlight_source,
-        "GNEWS": display_gnews_source,
-        "METEO": display_meteo_source,
-    }
-
     # Ensure session state initialization
     if 'active_source' not in st.session_state:
         st.session_state.active_source = None
 
     # Arrange buttons horizontally at the top using columns
-    cols = st.columns(len(sources))
+    cols = st.columns(len(SOURCES) + 1)
 
     # Render buttons with more explicit logic
-    for col, (source_name, display_func) in zip(cols, sources.items()):
+    for col, source_name in zip(cols, SOURCES):
         with col:
             if st.button(
                 f"Fetch {source_name}",
@@ -35,11 +43,70 @@ def display_source_fetch_buttons(universe):
             ):
                 st.session_state.active_source = source_name
 
+    with cols[-1]:
+        if st.button("Fetch all", use_container_width=True, type="primary", key="fetch_all"):
+            st.session_state.active_source = FETCH_ALL
+
     st.divider()
 
     # Clearly separated results section
-    if st.session_state.active_source:
+    if st.session_state.active_source == FETCH_ALL:
+        fetch_all_sources(universe)
+    elif st.session_state.active_source:
         st.subheader(f"Results from {st.session_state.active_source}")
-        sources[st.session_state.active_source](universe)
+        display_func, _ = SOURCES[st.session_state.active_source]
+        display_func(universe)
     else:
         st.info("Please select a data source to fetch results.")
+
+
+async def _timed_fetch(coro):
+    start = time.perf_counter()
+    result = await coro
+    return result, time.perf_counter() - start
+
+
+def fetch_all_sources(universe):
+    """Fetch every source concurrently and render each one as soon as it completes."""
+    if not universe:
+        st.warning("No universe selected.")
+        return
+
+    st.subheader("Results from all sources")
+    progress = st.progress(0.0, text=f"Fetching {len(SOURCES)} sources...")
+    status_cols = st.columns(len(SOURCES))
+    status_placeholders = {}
+    for col, source_name in zip(status_cols, SOURCES):
+        status_placeholders[source_name] = col.empty()
+        status_placeholders[source_name].caption(f"⏳ {source_name}")
+
+    start = time.perf_counter()
+    # All requests run concurrently on the async client's event loop; rendering stays on the script thread
+    client = get_async_client()
+    futures = {
+        submit(_timed_fetch(getattr(client, method_name)(universe))): source_name
+        for source_name, (_, method_name) in SOURCES.items()
+    }
+    for done, future in enumerate(as_completed(futures), start=1):
+        source_name = futures[future]
+        progress.progress(done / len(SOURCES), text=f"Fetched {done}/{len(SOURCES)} sources")
+        # A failing source is reported in its own slot; the remaining sources still render
+        try:
+            feed_result, elapsed = future.result()
+        except Exception as e:
+            print(f"Error fetching {source_name}: {str(e)}")
+            status_placeholders[source_name].caption(f"❌ {source_name}")
+            st.error(f"Error fetching {source_name}: {str(e)}")
+            continue
+
+        status_placeholders[source_name].caption(f"✅ {source_name} ({elapsed:.1f}s)")
+
+        display_func, _ = SOURCES[source_name]
+        with st.expander(f"{source_name} ({elapsed:.1f}s)", expanded=True):
+            try:
+                display_func(universe, feed_result=feed_result)
+            except Exception as e:
+                print(f"Error displaying {source_name}: {str(e)}")
+                st.error(f"Error displaying {source_name}: {str(e)}")
+
+    progress.progress(1.0, text=f"Fetched all sources in {time.perf_counter() - start:.1f}s")
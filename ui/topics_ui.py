@@ -1,16 +1,25 @@
 import streamlit as st
 from utils.plot_utils import create_one_feature_plot
-from utils.api_client import APIClient
-from utils.general_utils import filter_dataframe_by_time, get_topic_description, TIME_WINDOW_OPTIONS, TIME_WINDOW_DAY
+from utils import perf
+from utils.feed_store import get_feed_store, refresh_universe_feeds
+from utils.feed_catalog import get_feed_catalog
+from utils.general_utils import (
+    get_time_window_start,
+    get_time_window_fetch_start,
+    get_topic_description,
+    TIME_WINDOW_OPTIONS,
+    TIME_WINDOW_DAY,
+)
 
 def fetch_data(universe_name):
-    return APIClient.get_feed_from_db(universe_name=universe_name)
+    return get_feed_catalog(universe_name)
 
 
-def display_summary(topic_data):
-    if topic_data.empty:
+def display_summary(topic_catalog):
+    if topic_catalog.empty:
         return "No data available"
-    return " | ".join(f"{len(df)} {src}" for src, df in topic_data.groupby('source'))
+    row_counts = topic_catalog.groupby("source")["row_count"].sum()
+    return " | ".join(f"{count} {src}" for src, count in row_counts.items())
 
 
 def topic_display_name(universe, topic):
@@ -18,14 +27,31 @@ def topic_display_name(universe, topic):
     return f"{topic} ({desc})" if desc else topic
 
 
-def plot_features(universe_name, source, topic, features, time_window, displayed_features, display_name):
+def group_topic_window(universe_name, topic, time_window):
+    """Load a topic's rows for the time window once and split them by (source, feature_name)."""
+    window_store = get_feed_store(universe_name, since=get_time_window_fetch_start(time_window))
+    window_data = window_store.slice(topic=topic, start=get_time_window_start(time_window))
+    groups = window_data.groupby(["source", "feature_name"], observed=True, sort=False).indices
+    feature_frames = {(str(src), str(feature)): window_data.iloc[rows] for (src, feature), rows in groups.items()}
+    return window_data, feature_frames
+
+
+def plot_features(
+    universe_name, source, topic, features, time_window, displayed_features, display_name, feature_frames
+):
     for feature in features:
         feature_key = f"{source}:{feature}"
         if feature_key not in displayed_features:
-            fig, plot_key = create_one_feature_plot(universe_name, source, topic, feature, time_window)
+            feature_data = feature_frames.get((str(source), str(feature)))
+            if feature_data is None:
+                st.info(f"No {feature} data available for {topic} from {source}")
+                continue
+            fig, plot_key = create_one_feature_plot(
+                universe_name, source, topic, feature, time_window, feature_data=feature_data
+            )
             if fig:
                 st.subheader(f"{display_name} - {feature}")
-                st.plotly_chart(fig, use_container_width=True, key=plot_key)
+                perf.plotly_chart(fig, use_container_width=True, key=plot_key)
                 displayed_features.add(feature_key)
             else:
                 st.info(f"No {feature} data available for {topic} from {source}")
@@ -33,52 +59,54 @@ def plot_features(universe_name, source, topic, features, time_window, displayed
 
 def display_topic(universe):
     universe_name = universe.get("universe_name")
-    all_feed_data = fetch_data(universe_name)
+    catalog = fetch_data(universe_name)
 
-    if all_feed_data.empty:
+    if catalog.empty:
         st.warning("No data available for analysis. Please collect price and feed data.")
         return
 
-    available_topics = sorted(all_feed_data["topic"].unique())
+    available_topics = catalog.topics()
 
     header_col, refresh_col, summary_col = st.columns([1.5, 0.2, 3.3])
     header_col.header("🔍 Topic Dashboard")
 
     if refresh_col.button("🔄", help="Refresh data"):
-        st.cache_data.clear()
+        refresh_universe_feeds(universe_name)
         st.rerun()
 
     display_topics = {topic_display_name(universe, t): t for t in available_topics}
     selected_display_topic = st.selectbox("Select topic:", options=list(display_topics.keys()))
     selected_topic = display_topics[selected_display_topic]
 
-    topic_data = all_feed_data[all_feed_data["topic"] == selected_topic]
-    summary_col.caption(f"<span style='font-size:15px;'>{display_summary(topic_data)}</span>", unsafe_allow_html=True)
+    topic_catalog = catalog.frame(topic=selected_topic)
+    summary_col.caption(f"<span style='font-size:15px;'>{display_summary(topic_catalog)}</span>", unsafe_allow_html=True)
 
     time_window = st.selectbox("Time Window:", TIME_WINDOW_OPTIONS, index=TIME_WINDOW_OPTIONS.index(TIME_WINDOW_DAY))
 
-    if topic_data.empty:
+    if topic_catalog.empty:
         st.warning(f"No feed data available for {selected_display_topic}. Try another topic.")
         return
 
+    # One windowed load feeds every plot and the raw data view
+    window_data, feature_frames = group_topic_window(universe_name, selected_topic, time_window)
     displayed_features = set()
 
-    if "feature_is_target" in topic_data:
-        targets = topic_data[topic_data["feature_is_target"]].drop_duplicates(["source", "feature_name"])
-        if not targets.empty:
-            st.subheader(f"Target Variables for {selected_display_topic}")
-            for _, row in targets.iterrows():
-                plot_features(
-                    universe_name,
-                    row["source"],
-                    selected_topic,
-                    [row["feature_name"]],
-                    time_window,
-                    displayed_features,
-                    selected_display_topic
-                )
-
-    for source, df in topic_data.groupby("source"):
+    targets = catalog.targets(topic=selected_topic)
+    if not targets.empty:
+        st.subheader(f"Target Variables for {selected_display_topic}")
+        for _, row in targets.iterrows():
+            plot_features(
+                universe_name,
+                row["source"],
+                selected_topic,
+                [row["feature_name"]],
+                time_window,
+                displayed_features,
+                selected_display_topic,
+                feature_frames,
+            )
+
+    for source, df in topic_catalog.groupby("source"):
         with st.expander(f"{source.upper()} Data", expanded=True):
             plot_features(
                 universe_name,
@@ -87,9 +115,12 @@ def display_topic(universe):
                 df["feature_name"].unique(),
                 time_window,
                 displayed_features,
-                selected_display_topic
+                selected_display_topic,
+                feature_frames,
             )
 
     with st.expander("View Raw Data"):
-        raw_data = filter_dataframe_by_time(topic_data, time_window).sort_values("original_timestamp", ascending=False)
+        # feature_numeric is an internal parse of feature_value used for rollups and plots
+        raw_data = window_data.drop(columns="feature_numeric", errors="ignore")
+        raw_data = raw_data.sort_values("original_timestamp", ascending=False)
         st.dataframe(raw_data, use_container_width=True, height=300)
@@ -4,6 +4,9 @@ import streamlit as st
 import pandas as pd
 from utils.plot_utils import create_one_feature_plot
 from utils.api_client import APIClient
+from utils import perf
+from utils.feed_catalog import get_feed_catalog
+from utils.feed_ingest import to_utc
 from utils.general_utils import get_topic_description, TIME_WINDOW_OPTIONS, TIME_WINDOW_ALL
 
 
@@ -51,7 +54,7 @@ def display_universe(universe):
             universe_name=universe.get("universe_name"),
         )
         if last_update:
-            ts = pd.to_datetime(last_update)
+            ts = to_utc(last_update)
             st.caption(f"Last updated: {ts.strftime('%Y-%m-%d %H:%M:%S')}" if pd.notnull(ts) else "Last updated: N/A")
 
         display_universe_plot(universe.get("universe_name"), selected_source, selected_feature, time_window)
@@ -62,14 +65,10 @@ def display_universe(universe):
 def get_available_sources(universe):
     """Get available sources and their features from feed data"""
     try:
-        df = APIClient.get_feed_from_db(universe_name=universe.get("universe_name"))
-        if df is None or df.empty:
+        catalog = get_feed_catalog(universe.get("universe_name"))
+        if catalog.empty:
             return [], {}
-        sources = sorted(df["source"].unique().tolist())
-        features_by_source = {
-            source: sorted(df[df["source"] == source]["feature_name"].unique().tolist()) for source in sources
-        }
-        return sources, features_by_source
+        return catalog.sources(), catalog.features_by_source()
     except Exception as e:
         print(f"Error getting available options: {e}")
         return [], {}
@@ -112,7 +111,7 @@ def display_universe_plot(universe_name, selected_source, selected_feature, time
             plot_key = f"{selected_source}_all_{selected_feature}_{current_time_window}_{timestamp}"
 
         if feature_plot is not None:
-            st.plotly_chart(feature_plot, use_container_width=True, key=plot_key)
+            perf.plotly_chart(feature_plot, use_container_width=True, key=plot_key)
         else:
             display_name = topic_display if topic_display else feature_display
             st.warning(
@@ -1,38 +1,284 @@
 """API client for interacting with the backend API."""
 
-import requests
+import functools
+import inspect
+import threading
+import time
 import pandas as pd
-from typing import Optional
-import streamlit as st
-from config import API_BASE_URL
+from datetime import datetime
+from typing import Optional, Tuple
+from utils import http_session, perf
+from utils.delta_cache import DeltaFeedCache, feed_key, rows_after, rows_from
+from utils.disk_cache import FeedDiskCache
+from utils.feed_stream import FEED_ACCEPT, read_feed_frame
+from utils.memory_budget import MemoryBudget
+from utils.feed_ingest import (
+    compact_feed_frame,
+    normalize_feed_frame,
+    parse_timestamps,
+    project_columns,
+    sort_by_time,
+    time_slice,
+    to_utc,
+)
+from config import API_CACHE_TTL, API_CACHE_MAX_STALE, FEED_MEMORY_CACHE_MAX_BYTES
+from utils.swr_cache import (
+    call_key,
+    clear_all as clear_all_caches,
+    invalidate as invalidate_caches,
+    refresh_in_background,
+    swr_cache,
+)
+
+
+
+class SingleFlight:
+    """
+    Let concurrent identical calls share one execution.
+
+    The first caller for a key runs the function; callers arriving while it is in
+    flight wait for it and receive the same result (or exception).
+    """
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = {}  # name -> {"executed": int, "coalesced": int}
+
+    def do(self, name, key, fn, *args, **kwargs):
+        with self._lock:
+            stats = self._stats.setdefault(name, {"executed": 0, "coalesced": 0})
+            call = self._calls.get((name, key))
+            leader = call is None
+            if leader:
+                call = self._calls[(name, key)] = self._Call()
+                stats["executed"] += 1
+            else:
+                stats["coalesced"] += 1
+        perf.count(f"single_flight {name}", "executed" if leader else "coalesced")
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # Callers may modify returned frames, so followers get their own copy
+            return call.result.copy() if isinstance(call.result, pd.DataFrame) else call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[(name, key)]
+            call.done.set()
+
+    def stats(self):
+        """Return per-function counts of executed and coalesced calls."""
+        with self._lock:
+            return {name: dict(counts) for name, counts in self._stats.items()}
+
+
+# Cache namespaces, for scoped invalidation (see APIClient.invalidate_cache)
+UNIVERSES_NAMESPACE = "universes"
+FEED_NAMESPACE = "feed"
+NEWS_NAMESPACE = "news"
+# get_feed_from_db filters that identify an incremental feed frame
+FEED_FILTERS = ["source", "topic", "topic_category", "feature_name", "feature_category", "universe_name"]
+
+_single_flight = SingleFlight()
+# Incremental base frames and cached feed results share one memory budget
+_memory_budget = MemoryBudget(FEED_MEMORY_CACHE_MAX_BYTES)
+_delta_cache = DeltaFeedCache(budget=_memory_budget)
+_disk_cache = FeedDiskCache()
+
+
+def coalesced(func):
+    """Coalesce concurrent calls of func with identical arguments into one backend request."""
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return _single_flight.do(func.__name__, call_key(signature, args, kwargs), func, *args, **kwargs)
+
+    return wrapper
+
+
+def _feed_columns(columns):
+    """Normalize a column projection; timestamps are always needed for windowing and incremental merges."""
+    if columns is None:
+        return None
+    return tuple(dict.fromkeys(("created_timestamp",) + tuple(columns)))
+
+
+def _fetch_feed(params, columns=None, until=None):
+    """Request /db/feed with params and return its rows projected to columns and bounded by until."""
+    # Remove None values from params
+    params = {k: v for k, v in params.items() if v is not None}
+    # Streamed, so rows are decoded into compact batches while the body is still downloading
+    with http_session.get("/db/feed", params=params, headers={"Accept": FEED_ACCEPT}, stream=True) as response:
+        response.raise_for_status()
+        with perf.timer("decode /db/feed"):
+            df = read_feed_frame(response)
+
+    df = project_columns(df, columns)
+    if until is not None:
+        df = time_slice(df, end=until)
+    return df
+
+
+def _sync_feed(key, since=None):
+    """
+    Bring the incremental frame for key (see feed_key) up to date with the backend.
+
+    Returns the rows from since onwards, a slice of the cached frame.
+    """
+    params = dict(key)
+    columns = tuple(params["columns"].split(",")) if "columns" in params else None
+
+    fetch_since, is_incremental = _delta_cache.plan(key, since)
+    perf.count("delta_cache", "incremental" if is_incremental else "full")
+    if fetch_since is not None:
+        params["since"] = fetch_since.isoformat()
+    df = _fetch_feed(params, columns)
+
+    new_rows = rows_after(df, fetch_since) if is_incremental else df
+    has_new_rows = new_rows is not None and not new_rows.empty
+    rows = _delta_cache.merge(key, new_rows, fetch_since, is_incremental, since)
+    if rows is None:
+        # The base frame was dropped (memory budget or invalidation) during the fetch; plan a full one
+        perf.count("delta_cache", "lost_base")
+        return _sync_feed(key, since)
+
+    # The new frame may already have been evicted by a concurrent fetch
+    meta = _delta_cache.meta(key)
+    if meta is not None and is_incremental and not has_new_rows:
+        _disk_cache.touch(key)
+    elif meta is not None and (not is_incremental or not _disk_cache.append(key, new_rows, fetch_since)):
+        # Incremental rows are appended as a segment; full fetches (and compaction) rewrite the file
+        covered_from = meta["covered_from"]
+        meta["covered_from"] = covered_from.isoformat() if covered_from is not None else None
+        _disk_cache.store(key, _delta_cache.frame(key), meta)
+    return rows
+
+
+def _revalidate_feed(key, since=None):
+    """Sync the frame for key in the background, at most one refresh per key at a time."""
+    refresh_in_background((FEED_NAMESPACE, key), _sync_feed, key, since)
+
+
+def _derive_feed(key, since=None, until=None):
+    """Filter the rows for key from a cached frame with fewer filters (see DeltaFeedCache.derive), or return None."""
+    derived = _delta_cache.derive(key, since, until, max_age=API_CACHE_MAX_STALE)
+    if derived is None:
+        return None
+    df, source_key, age = derived
+    perf.count("delta_cache", "derived")
+    if age >= API_CACHE_TTL:
+        meta = _delta_cache.meta(source_key)
+        if meta is not None:
+            _revalidate_feed(source_key, meta["covered_from"])
+    return df
+
+
+def _incremental_feed_rows(key, since=None):
+    """Return the rows from since onwards of the incremental frame for key (a slice of it), syncing it as needed."""
+    # Cold start (new process or worker): warm up from the shared on-disk cache
+    if not _delta_cache.has(key):
+        cached, meta, is_fresh = _disk_cache.load(key)
+        perf.count("disk_cache", "miss" if cached is None else "fresh" if is_fresh else "stale")
+        if cached is not None:
+            # Files written before timestamps were normalized hold naive UTC values
+            cached = sort_by_time(compact_feed_frame(normalize_feed_frame(cached)))
+            synced_at = time.time() if is_fresh else 0
+            _delta_cache.seed(key, cached, meta.get("full_fetched_at", 0), to_utc(meta.get("covered_from")), synced_at)
+
+    # A new window start (see FEED_WINDOW_GRANULARITY) needs no request while the frame covers it
+    cached = _delta_cache.cached_rows(key, since)
+    if cached is not None:
+        rows, age = cached
+        if age < API_CACHE_TTL:
+            perf.count("delta_cache", "fresh")
+            return rows
+        if age < API_CACHE_MAX_STALE:
+            perf.count("delta_cache", "stale")
+            _revalidate_feed(key, since)
+            return rows
+    # Concurrent identical syncs share one request
+    return _single_flight.do("sync_feed", (key, since), _sync_feed, key, since)
 
 
 class APIClient:
     """Client for interacting with the SOTW API."""
 
     @staticmethod
+    @perf.timed()
     def get_health_status():
         """Check API health status."""
         try:
-            response = requests.get(f"{API_BASE_URL}/health")
+            response = http_session.get("/health")
             return response.json()
         except Exception as e:
             return {"status": "ERROR", "db": f"ERROR: {str(e)}", "message": str(e)}
 
     @staticmethod
-    @st.cache_data(ttl=300)  # Cache for 5 minutes
+    def clear_cache():
+        """Drop all cached API results so the next calls refetch (incrementally for feeds)."""
+        clear_all_caches()
+        _delta_cache.expire()
+
+    @staticmethod
+    def invalidate_cache(namespace: Optional[str] = None, **scope):
+        """
+        Drop only the cached API results of a namespace within scope, e.g.
+        invalidate_cache(FEED_NAMESPACE, universe_name="U1", source="reddit").
+
+        Results fetched without a scoped filter (say, for all sources) are dropped too,
+        as they include the scoped rows. Incremental feed frames are kept but marked as
+        not synced, so the next feed calls only fetch newer rows. Returns the number of
+        entries dropped or marked.
+        """
+        dropped = invalidate_caches(namespace, **scope)
+        if namespace in (None, FEED_NAMESPACE) and set(scope) <= set(FEED_FILTERS):
+            dropped += _delta_cache.expire(**scope)
+        return dropped
+
+    @staticmethod
+    def get_memory_stats():
+        """Get the bytes held by cached feed frames against the budget, and how many were evicted."""
+        return _memory_budget.stats()
+
+    @staticmethod
+    def get_memory_report():
+        """Get the rows and memory size of each incrementally cached feed frame (see DeltaFeedCache.report)."""
+        return _delta_cache.report()
+
+    @staticmethod
+    def get_coalescing_stats():
+        """Get how many backend calls were executed and how many were coalesced, per method."""
+        return _single_flight.stats()
+
+    @staticmethod
+    @perf.timed()
+    @swr_cache(fallback=[], namespace=UNIVERSES_NAMESPACE)
+    @coalesced
     def get_all_universes():
         """Get all universes from the API."""
-        try:
-            response = requests.get(f"{API_BASE_URL}/db/universes")
-            return response.json().get("universes", [])
-        except Exception as e:
-            print(f"Error fetching universes: {e}")
-            return []
+        response = http_session.get("/db/universes")
+        response.raise_for_status()
+        return response.json().get("universes", [])
 
    
     @staticmethod
-    @st.cache_data(ttl=300)  # Cache for 5 minutes
+    @perf.timed()
     def get_feed_from_db(
         source: Optional[str] = None,
         topic: Optional[str] = None,
@@ -41,38 +287,116 @@ class APIClient:
         feature_category: Optional[str] = None,
         limit: Optional[int] = None,
         universe_name: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        columns: Optional[Tuple[str, ...]] = None,
+        incremental: bool = True,
+        copy: bool = True,
     ):
-        """Get feed data from the database with optional filters."""
+        """
+        Get feed data from the database with optional filters.
+
+        since/until bound created_timestamp and columns projects the result; both are sent
+        to the backend and re-applied here in case it ignores them. Pass a since that is
+        stable across reruns (see get_time_window_fetch_start) so it shares cache keys.
+
+        In incremental mode the last full frame for these filters is kept (in memory and
+        in the on-disk cache) and only rows newer than its latest created_timestamp are
+        requested from the backend. Results are sliced from that frame rather than cached
+        separately: a frame synced within API_CACHE_TTL is served as is, an older one (up to
+        API_CACHE_MAX_STALE) is served while it syncs in the background. A request with more
+        filters is filtered from a cached frame with fewer instead of keeping another copy.
+
+        copy=False returns a slice of the cached frame instead of a copy, for callers that
+        only read it (e.g. FeedStore); fixed windows (limit or until) are always copies.
+        """
+        # Feed timestamps are tz-aware UTC, so bounds must be as well
+        since, until = to_utc(since), to_utc(until)
+        columns = _feed_columns(columns)
+
+        params = {
+            "source": source,
+            "topic": topic,
+            "topic_category": topic_category,
+            "feature_name": feature_name,
+            "feature_category": feature_category,
+            "universe_name": universe_name,
+            "columns": ",".join(columns) if columns is not None else None,
+        }
+        # "since" is left out of the key: one frame serves every window it covers
+        key = feed_key(params)
+
         try:
-            params = {
-                "source": source,
-                "topic": topic,
-                "topic_category": topic_category,
-                "feature_name": feature_name,
-                "feature_category": feature_category,
-                "limit": limit,
-                "universe_name": universe_name,
-            }
-            # Remove None values from params
-            params = {k: v for k, v in params.items() if v is not None}
-
-            response = requests.get(f"{API_BASE_URL}/db/feed", params=params)
-            data = response.json().get("data", [])
-
-            if data:
-                df = pd.DataFrame(data)
-                # Convert timestamp columns to datetime using ISO8601 format
-                for col in ["created_timestamp", "original_timestamp"]:
-                    if col in df.columns:
-                        df[col] = pd.to_datetime(df[col], format="ISO8601")
-                return df
-            return None
+            if limit is None and not _delta_cache.has(key):
+                derived = _derive_feed(key, since, until)
+                if derived is not None:
+                    return derived if not derived.empty else None
+
+            # A row limit or end bound makes the result a fixed window rather than a growing history,
+            # so it is never merged into a frame
+            if not incremental or limit is not None or until is not None:
+                return APIClient._get_feed_window(
+                    source=source, topic=topic, topic_category=topic_category, feature_name=feature_name,
+                    feature_category=feature_category, limit=limit, universe_name=universe_name,
+                    since=since, until=until, columns=columns,
+                )
+
+            df = _incremental_feed_rows(key, since)
         except Exception as e:
-            print(f"Error fetching feed data: {e}")
+            print(f"Error in get_feed_from_db: {e}")
+            return None
+        if df is None or df.empty:
             return None
+        return df.copy() if copy else df
+
+    @staticmethod
+    @perf.timed()
+    @swr_cache(fallback=None, namespace=FEED_NAMESPACE, budget=_memory_budget)
+    @coalesced
+    def _get_feed_window(
+        source=None,
+        topic=None,
+        topic_category=None,
+        feature_name=None,
+        feature_category=None,
+        limit=None,
+        universe_name=None,
+        since=None,
+        until=None,
+        columns=None,
+    ):
+        """Fetch a fixed window of feed rows (see get_feed_from_db), cached as is."""
+        params = {
+            "source": source,
+            "topic": topic,
+            "topic_category": topic_category,
+            "feature_name": feature_name,
+            "feature_category": feature_category,
+            "limit": limit,
+            "universe_name": universe_name,
+            "since": since.isoformat() if since is not None else None,
+            "until": until.isoformat() if until is not None else None,
+            "columns": ",".join(columns) if columns is not None else None,
+        }
+        df = rows_from(_fetch_feed(params, columns, until), since)
+        return df if df is not None and not df.empty else None
 
     @staticmethod
-    @st.cache_data(ttl=300)  # Cache for 5 minutes
+    def get_feed_rollups(universe_name: Optional[str] = None, columns: Optional[Tuple[str, ...]] = None):
+        """
+        Get the rollups (see utils.rollups) of the incrementally fetched feed of a universe.
+
+        Returns None until get_feed_from_db has loaded that feed. The rollups follow every
+        later incremental fetch, updating only the buckets of the new rows.
+        """
+        columns = _feed_columns(columns)
+        params = {"universe_name": universe_name, "columns": ",".join(columns) if columns is not None else None}
+        return _delta_cache.rollups(feed_key(params))
+
+    @staticmethod
+    @perf.timed()
+    @swr_cache(fallback=None, namespace=FEED_NAMESPACE)
+    @coalesced
     def get_latest_feed_timestamp(
         source: Optional[str] = None,
         topic: Optional[str] = None,
@@ -80,21 +404,41 @@ class APIClient:
         universe_name: Optional[str] = None,
     ):
         """Get the timestamp of the most recent feed entry."""
-        try:
-            params = {"source": source, "topic": topic, "feature_name": feature_name, "universe_name": universe_name}
-            # Remove None values from params
-            params = {k: v for k, v in params.items() if v is not None}
+        params = {"source": source, "topic": topic, "feature_name": feature_name, "universe_name": universe_name}
+        # Remove None values from params
+        params = {k: v for k, v in params.items() if v is not None}
 
-            response = requests.get(f"{API_BASE_URL}/db/feed/latest-timestamp", params=params)
-            return response.json().get("latest_timestamp")
-        except Exception as e:
-            print(f"Error fetching latest timestamp: {e}")
+        response = http_session.get("/db/feed/latest-timestamp", params=params)
+        response.raise_for_status()
+        return response.json().get("latest_timestamp")
+
+    @staticmethod
+    @perf.timed()
+    @swr_cache(fallback=None, namespace=FEED_NAMESPACE)
+    @coalesced
+    def get_feed_catalog(universe_name: Optional[str] = None):
+        """
+        Get the distinct (source, topic, feature_name) feeds with first/last timestamp and row count.
+
+        Returns None when the backend has no catalog endpoint, so callers can derive it from feed rows.
+        """
+        params = {"universe_name": universe_name} if universe_name is not None else {}
+        response = http_session.get("/db/feed/catalog", params=params)
+        if response.status_code == 404:
             return None
+        response.raise_for_status()
+
+        catalog = pd.DataFrame(response.json().get("data", []))
+        for col in ["first_timestamp", "last_timestamp"]:
+            if col in catalog.columns:
+                catalog[col] = parse_timestamps(catalog[col])
+        return catalog
 
     @staticmethod
+    @perf.timed()
     def create_fmp_feed(universe):
         try:
-            response = requests.post(f"{API_BASE_URL}/feed/fmp", json=universe)
+            response = http_session.post("/feed/fmp", json=universe)
             data = response.json()
             return data.get("universe_feeds", [])
         except Exception as e:
@@ -102,9 +446,10 @@ class APIClient:
             return []
 
     @staticmethod
+    @perf.timed()
     def create_alpha_feed(universe):
         try:
-            response = requests.post(f"{API_BASE_URL}/feed/alpha", json=universe)
+            response = http_session.post("/feed/alpha", json=universe)
             data = response.json()
             return (
                 data.get("universe_feeds", []),
@@ -115,9 +460,10 @@ class APIClient:
             return [], 0.0
 
     @staticmethod
+    @perf.timed()
     def create_newsapi_feed(universe):
         try:
-            response = requests.post(f"{API_BASE_URL}/feed/newsapi", json=universe)
+            response = http_session.post("/feed/newsapi", json=universe)
             data = response.json()
             return (
                 data.get("universe_feeds", []),
@@ -128,9 +474,10 @@ class APIClient:
             return [], 0.0
         
     @staticmethod
+    @perf.timed()
     def create_gnews_feed(universe):
         try:
-            response = requests.post(f"{API_BASE_URL}/feed/gnews", json=universe)
+            response = http_session.post("/feed/gnews", json=universe)
             data = response.json()
             return data.get("universe_feeds", []), data.get("overall_sentiment_average", 0)
         except Exception as e:
@@ -138,9 +485,10 @@ class APIClient:
             return [], 0
 
     @staticmethod
+    @perf.timed()
     def create_finlight_feed(universe):
         try:
-            response = requests.post(f"{API_BASE_URL}/feed/finlight", json=universe)
+            response = http_session.post("/feed/finlight", json=universe)
             data = response.json()
             return data.get("universe_feeds", []), data.get("overall_sentiment_average", 0)
         except Exception as e:
@@ -148,9 +496,10 @@ class APIClient:
             return [], 0
 
     @staticmethod
+    @perf.timed()
     def create_reddit_feed(universe):
         try:
-            response = requests.post(f"{API_BASE_URL}/feed/reddit", json=universe)
+            response = http_session.post("/feed/reddit", json=universe)
             data = response.json()
             return data.get("universe_feeds", []), data.get("overall_sentiment_average", 0)
         except Exception as e:
@@ -158,9 +507,10 @@ class APIClient:
             return [], 0
 
     @staticmethod
+    @perf.timed()
     def create_meteo_feed(universe):
         try:
-            response = requests.post(f"{API_BASE_URL}/feed/meteo", json=universe)
+            response = http_session.post("/feed/meteo", json=universe)
             data = response.json()
             return data.get("universe_feeds", [])
         except Exception as e:
@@ -168,13 +518,12 @@ class APIClient:
             return []
 
     @staticmethod
-    @st.cache_data(ttl=300)  # Cache for 5 minutes
+    @perf.timed()
+    @swr_cache(fallback=([], 0), namespace=NEWS_NAMESPACE)
+    @coalesced
     def get_top_news(max_results=10):
         """Get top news articles."""
-        try:
-            response = requests.get(f"{API_BASE_URL}/news/top", params={"max_results": max_results})
-            data = response.json()
-            return data.get("data", []), data.get("count", 0)
-        except Exception as e:
-            print(f"Error fetching top news: {e}")
-            return [], 0
+        response = http_session.get("/news/top", params={"max_results": max_results})
+        response.raise_for_status()
+        data = response.json()
+        return data.get("data", []), data.get("count", 0)
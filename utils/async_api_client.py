@@ -0,0 +1,229 @@
+"""Asynchronous API client, plus a sync bridge for awaiting it from Streamlit scripts."""
+
+import asyncio
+import threading
+from datetime import datetime
+from typing import Optional, Tuple
+
+import httpx
+
+from config import API_BASE_URL, API_POOL_MAXSIZE
+from utils import perf
+from utils.api_client import _feed_columns
+from utils.delta_cache import rows_from
+from utils.feed_ingest import feed_frame_from_records, project_columns, time_slice, to_utc
+from utils.http_session import get_timeout
+
+
+class AsyncAPIClient:
+    """
+    Asynchronous client for the SOTW API with the same methods and return values as APIClient.
+
+    Calls are not cached; use it to issue several requests concurrently, e.g. with
+    gather_sync(client.get_feed_from_db(...), client.get_feed_from_db(...)).
+    """
+
+    def __init__(self, base_url=API_BASE_URL):
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            limits=httpx.Limits(max_connections=API_POOL_MAXSIZE, max_keepalive_connections=API_POOL_MAXSIZE),
+            headers={"Accept-Encoding": "gzip, deflate"},
+        )
+
+    async def _request(self, method, path, **kwargs):
+        connect_timeout, read_timeout = get_timeout(path)
+        return await self._client.request(
+            method, path, timeout=httpx.Timeout(read_timeout, connect=connect_timeout), **kwargs
+        )
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    @perf.timed()
+    async def get_health_status(self):
+        """Check API health status."""
+        try:
+            response = await self._request("GET", "/health")
+            return response.json()
+        except Exception as e:
+            return {"status": "ERROR", "db": f"ERROR: {str(e)}", "message": str(e)}
+
+    @perf.timed()
+    async def get_all_universes(self):
+        """Get all universes from the API."""
+        try:
+            response = await self._request("GET", "/db/universes")
+            response.raise_for_status()
+            return response.json().get("universes", [])
+        except Exception as e:
+            print(f"Error fetching universes: {e}")
+            return []
+
+    @perf.timed()
+    async def get_feed_from_db(
+        self,
+        source: Optional[str] = None,
+        topic: Optional[str] = None,
+        topic_category: Optional[str] = None,
+        feature_name: Optional[str] = None,
+        feature_category: Optional[str] = None,
+        limit: Optional[int] = None,
+        universe_name: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        columns: Optional[Tuple[str, ...]] = None,
+    ):
+        """Get feed data from the database with optional filters (see APIClient.get_feed_from_db)."""
+        try:
+            since, until = to_utc(since), to_utc(until)
+            columns = _feed_columns(columns)
+
+            params = {
+                "source": source,
+                "topic": topic,
+                "topic_category": topic_category,
+                "feature_name": feature_name,
+                "feature_category": feature_category,
+                "limit": limit,
+                "universe_name": universe_name,
+                "since": since.isoformat() if since is not None else None,
+                "until": until.isoformat() if until is not None else None,
+                "columns": ",".join(columns) if columns is not None else None,
+            }
+            # Remove None values from params
+            params = {k: v for k, v in params.items() if v is not None}
+
+            response = await self._request("GET", "/db/feed", params=params)
+            response.raise_for_status()
+            df = feed_frame_from_records(response.json().get("data", []))
+            if df is None:
+                return None
+
+            # Re-apply the window and projection in case the backend ignores them
+            df = project_columns(df, columns)
+            if until is not None:
+                df = time_slice(df, end=until)
+            df = rows_from(df, since)
+            return df if not df.empty else None
+        except Exception as e:
+            print(f"Error fetching feed data: {e}")
+            return None
+
+    @perf.timed()
+    async def get_latest_feed_timestamp(
+        self,
+        source: Optional[str] = None,
+        topic: Optional[str] = None,
+        feature_name: Optional[str] = None,
+        universe_name: Optional[str] = None,
+    ):
+        """Get the timestamp of the most recent feed entry."""
+        try:
+            params = {"source": source, "topic": topic, "feature_name": feature_name, "universe_name": universe_name}
+            # Remove None values from params
+            params = {k: v for k, v in params.items() if v is not None}
+
+            response = await self._request("GET", "/db/feed/latest-timestamp", params=params)
+            response.raise_for_status()
+            return response.json().get("latest_timestamp")
+        except Exception as e:
+            print(f"Error fetching latest timestamp: {e}")
+            return None
+
+    async def _create_feed(self, path, name, universe, sentiment_default=None):
+        """POST a universe to a source endpoint; returns feeds, plus the sentiment average when sentiment_default is set."""
+        try:
+            response = await self._request("POST", path, json=universe)
+            data = response.json()
+            if sentiment_default is None:
+                return data.get("universe_feeds", [])
+            return data.get("universe_feeds", []), data.get("overall_sentiment_average", sentiment_default)
+        except Exception as e:
+            print(f"Error processing {name} feed: {e}")
+            return [] if sentiment_default is None else ([], sentiment_default)
+
+    @perf.timed()
+    async def create_fmp_feed(self, universe):
+        return await self._create_feed("/feed/fmp", "FMP", universe)
+
+    @perf.timed()
+    async def create_alpha_feed(self, universe):
+        return await self._create_feed("/feed/alpha", "Alpha", universe, 0.0)
+
+    @perf.timed()
+    async def create_newsapi_feed(self, universe):
+        return await self._create_feed("/feed/newsapi", "NewsAPI", universe, 0.0)
+
+    @perf.timed()
+    async def create_gnews_feed(self, universe):
+        return await self._create_feed("/feed/gnews", "GNews", universe, 0)
+
+    @perf.timed()
+    async def create_finlight_feed(self, universe):
+        return await self._create_feed("/feed/finlight", "Finlight", universe, 0)
+
+    @perf.timed()
+    async def create_reddit_feed(self, universe):
+        return await self._create_feed("/feed/reddit", "Reddit", universe, 0)
+
+    @perf.timed()
+    async def create_meteo_feed(self, universe):
+        return await self._create_feed("/feed/meteo", "Meteo", universe)
+
+    @perf.timed()
+    async def get_top_news(self, max_results=10):
+        """Get top news articles."""
+        try:
+            response = await self._request("GET", "/news/top", params={"max_results": max_results})
+            response.raise_for_status()
+            data = response.json()
+            return data.get("data", []), data.get("count", 0)
+        except Exception as e:
+            print(f"Error fetching top news: {e}")
+            return [], 0
+
+
+# Streamlit runs scripts on plain threads without an event loop, so coroutines are run on
+# one long-lived loop in a background thread. The shared client (and its connection pool)
+# belongs to that loop.
+_loop = None
+_client = None
+_bridge_lock = threading.Lock()
+
+
+def _get_loop():
+    global _loop
+    with _bridge_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="async-api-client", daemon=True).start()
+            _loop = loop
+    return _loop
+
+
+def get_async_client():
+    """Return the shared AsyncAPIClient used with the sync bridge."""
+    global _client
+    with _bridge_lock:
+        if _client is None:
+            _client = AsyncAPIClient()
+    return _client
+
+
+def submit(coro):
+    """Schedule a coroutine on the bridge loop and return a concurrent.futures.Future for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop())
+
+
+def run_sync(coro, timeout=None):
+    """Run a coroutine on the bridge loop and wait for its result."""
+    return submit(coro).result(timeout)
+
+
+def gather_sync(*coros, timeout=None):
+    """Run several coroutines concurrently and return their results in order."""
+
+    async def _gather():
+        return await asyncio.gather(*coros)
+
+    return run_sync(_gather(), timeout)
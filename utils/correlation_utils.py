@@ -0,0 +1,250 @@
+"""Vectorized correlation analysis across many feeds."""
+
+import numpy as np
+import pandas as pd
+from scipy.stats import rankdata
+
+from utils.feed_ingest import numeric_feature_values
+
+# Columns identifying one feed series
+SERIES_KEY_COLUMNS = ["topic", "source", "feature_name"]
+
+
+def series_label(topic, source, feature_name):
+    return f"{topic} - {feature_name} ({source})"
+
+
+def align_feeds_to_grid(df, freq="1h"):
+    """
+    Align every numeric (topic, source, feature_name) series of a feed frame onto a common time grid.
+
+    Values are averaged per grid bucket; non-numeric series are dropped. Rollup buckets (frames
+    with sum and count columns, see utils.rollups) are weighted by their row counts, so a grid
+    made of whole rollup buckets gives the same means as raw rows. Returns a wide frame
+    indexed by bucket start with one column per series.
+    """
+    if df is None or df.empty:
+        return pd.DataFrame()
+
+    if "sum" in df.columns and "count" in df.columns:
+        buckets = df[SERIES_KEY_COLUMNS + ["sum", "count"]].copy()
+        buckets["bucket"] = df["created_timestamp"].dt.floor(freq)
+        totals = buckets.pivot_table(
+            index="bucket", columns=SERIES_KEY_COLUMNS, values=["sum", "count"], aggfunc="sum", observed=True
+        )
+        wide = totals["sum"] / totals["count"]
+        wide.columns = [series_label(*key) for key in wide.columns]
+        return wide.sort_index()
+
+    values = numeric_feature_values(df)
+    numeric = df.loc[values.notna(), SERIES_KEY_COLUMNS + ["created_timestamp"]].copy()
+    if numeric.empty:
+        return pd.DataFrame()
+    numeric["feature_value"] = values[values.notna()]
+    numeric["bucket"] = numeric["created_timestamp"].dt.floor(freq)
+
+    wide = numeric.pivot_table(
+        index="bucket", columns=SERIES_KEY_COLUMNS, values="feature_value", aggfunc="mean", observed=True
+    )
+    wide.columns = [series_label(*key) for key in wide.columns]
+    return wide.sort_index()
+
+
+def correlation_matrix(wide, method="spearman", min_periods=3):
+    """
+    Compute the pairwise correlation of every column of a wide frame in one pass.
+
+    Missing values are handled pairwise: each coefficient uses the grid buckets where both
+    series have data, via matrix products over the presence mask. For Spearman each series
+    is ranked once over the whole grid rather than per pair, which closely approximates the
+    exact pairwise coefficient when overlaps are large.
+
+    Returns (correlations, overlap_counts) as square frames; pairs with fewer than
+    min_periods shared buckets are NaN.
+    """
+    if wide.empty:
+        return pd.DataFrame(), pd.DataFrame()
+
+    data = wide.rank() if method == "spearman" else wide
+    x = data.to_numpy(dtype=np.float64)
+    present = (~np.isnan(x)).astype(np.float64)
+    x = np.nan_to_num(x)
+
+    n = present.T @ present
+    sum_x = x.T @ present  # sum_x[i, j]: sum of series i over buckets where series j is present
+    sum_y = sum_x.T
+    sum_xx = (x * x).T @ present
+    sum_yy = sum_xx.T
+    sum_xy = x.T @ x
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sum_xy - sum_x * sum_y / n
+        var_x = sum_xx - sum_x**2 / n
+        var_y = sum_yy - sum_y**2 / n
+        corr = cov / np.sqrt(var_x * var_y)
+
+    corr[n < min_periods] = np.nan
+    corr = np.clip(corr, -1.0, 1.0)
+
+    labels = wide.columns
+    return pd.DataFrame(corr, index=labels, columns=labels), pd.DataFrame(n.astype(np.int64), index=labels, columns=labels)
+
+
+def top_correlated_pairs(corr, overlap_counts, k=20):
+    """Return the k distinct series pairs with the strongest absolute correlation."""
+    if corr.empty:
+        return pd.DataFrame(columns=["feed_1", "feed_2", "correlation", "overlap"])
+
+    rows, cols = np.triu_indices(len(corr), k=1)
+    values = corr.to_numpy()[rows, cols]
+    valid = ~np.isnan(values)
+    rows, cols, values = rows[valid], cols[valid], values[valid]
+    order = np.argsort(-np.abs(values))[:k]
+
+    labels = corr.index.to_numpy()
+    return pd.DataFrame(
+        {
+            "feed_1": labels[rows[order]],
+            "feed_2": labels[cols[order]],
+            "correlation": values[order],
+            "overlap": overlap_counts.to_numpy()[rows[order], cols[order]],
+        }
+    )
+
+
+def resample_feed(df, freq):
+    """Average a single feed's numeric values onto a regular time grid."""
+    values = numeric_feature_values(df)
+    series = pd.Series(values.to_numpy(), index=pd.DatetimeIndex(df["created_timestamp"])).dropna()
+    return series.resample(freq).mean()
+
+
+def _lagged_sums(a, b, max_lag):
+    """Return sum_t a[t] * b[t + lag] for lag in [-max_lag, max_lag], computed with one FFT product."""
+    n = len(a)
+    size = 1 << int(np.ceil(np.log2(2 * n - 1)))
+    full = np.fft.irfft(np.conj(np.fft.rfft(a, size)) * np.fft.rfft(b, size), size)
+    # Non-negative lags sit at the start of the circular result, negative ones wrap around to the end
+    return np.concatenate([full[size - max_lag :], full[: max_lag + 1]])
+
+
+def lagged_cross_correlation(series1, series2, freq, max_lag_steps, method="pearson", min_periods=3):
+    """
+    Correlate series1(t) with series2(t + lag) for every lag in [-max_lag_steps, max_lag_steps] grid steps.
+
+    Both series are put on a shared regular grid; missing buckets are excluded pairwise, with
+    every per-lag sum obtained from FFT products so the whole scan costs O(n log n). A positive
+    best lag means series1 leads series2.
+
+    Returns a frame with columns lag, lag_timedelta, correlation and overlap.
+    """
+    start = min(series1.index.min(), series2.index.min())
+    end = max(series1.index.max(), series2.index.max())
+    grid = pd.date_range(start.floor(freq), end, freq=freq)
+    x = series1.reindex(grid)
+    y = series2.reindex(grid)
+    if method == "spearman":
+        x, y = x.rank(), y.rank()
+
+    x = x.to_numpy(dtype=np.float64)
+    y = y.to_numpy(dtype=np.float64)
+    max_lag_steps = int(min(max_lag_steps, len(grid) - 1))
+    mask_x = (~np.isnan(x)).astype(np.float64)
+    mask_y = (~np.isnan(y)).astype(np.float64)
+    x = np.nan_to_num(x)
+    y = np.nan_to_num(y)
+
+    n = np.rint(_lagged_sums(mask_x, mask_y, max_lag_steps))
+    sum_x = _lagged_sums(x, mask_y, max_lag_steps)
+    sum_y = _lagged_sums(mask_x, y, max_lag_steps)
+    sum_xx = _lagged_sums(x * x, mask_y, max_lag_steps)
+    sum_yy = _lagged_sums(mask_x, y * y, max_lag_steps)
+    sum_xy = _lagged_sums(x, y, max_lag_steps)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sum_xy - sum_x * sum_y / n
+        var_x = sum_xx - sum_x**2 / n
+        var_y = sum_yy - sum_y**2 / n
+        corr = np.clip(cov / np.sqrt(var_x * var_y), -1.0, 1.0)
+    corr[n < min_periods] = np.nan
+
+    lags = np.arange(-max_lag_steps, max_lag_steps + 1)
+    return pd.DataFrame(
+        {
+            "lag": lags,
+            "lag_timedelta": lags * pd.Timedelta(freq),
+            "correlation": corr,
+            "overlap": n.astype(np.int64),
+        }
+    )
+
+
+def best_lag(lag_correlations):
+    """Return the row of the lag with the strongest absolute correlation, or None."""
+    valid = lag_correlations.dropna(subset=["correlation"])
+    if valid.empty:
+        return None
+    return valid.loc[valid["correlation"].abs().idxmax()]
+
+
+def rolling_correlation(timestamps, x, y, window, step, method="pearson", min_periods=3):
+    """
+    Correlate two aligned series over a time window sliding forward by step.
+
+    Window bounds are located by binary search on the sorted timestamps and every
+    window is evaluated from running (cumulative) sums in O(1), so the whole curve
+    costs O(n) regardless of window size. For Spearman each series is ranked once over
+    the whole range and the ranks are correlated per window, an O(n) approximation of
+    re-ranking every window.
+
+    Returns a frame with columns window_end, correlation and count.
+    """
+    index = pd.DatetimeIndex(timestamps)
+    if len(index) == 0:
+        return pd.DataFrame(columns=["window_end", "correlation", "count"])
+    # Work in integer nanoseconds (UTC for tz-aware timestamps)
+    t = index.values.astype("datetime64[ns]").astype(np.int64)
+    window_ns = pd.Timedelta(window).value
+    step_ns = pd.Timedelta(step).value
+
+    first_end = min(t[0] + window_ns, t[-1])
+    ends = np.minimum(np.arange(first_end, t[-1] + step_ns, step_ns), t[-1])
+    end_idx = np.searchsorted(t, ends, side="right")
+    start_idx = np.searchsorted(t, ends - window_ns, side="right")
+    counts = end_idx - start_idx
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if method == "spearman":
+        x, y = rankdata(x), rankdata(y)
+
+    # Centering first keeps the running-sum differences numerically stable
+    x = x - x.mean()
+    y = y - y.mean()
+    zero = np.zeros(1)
+    cum_x = np.concatenate([zero, np.cumsum(x)])
+    cum_y = np.concatenate([zero, np.cumsum(y)])
+    cum_xx = np.concatenate([zero, np.cumsum(x * x)])
+    cum_yy = np.concatenate([zero, np.cumsum(y * y)])
+    cum_xy = np.concatenate([zero, np.cumsum(x * y)])
+
+    n = counts.astype(np.float64)
+    sum_x = cum_x[end_idx] - cum_x[start_idx]
+    sum_y = cum_y[end_idx] - cum_y[start_idx]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = (cum_xy[end_idx] - cum_xy[start_idx]) - sum_x * sum_y / n
+        var_x = (cum_xx[end_idx] - cum_xx[start_idx]) - sum_x**2 / n
+        var_y = (cum_yy[end_idx] - cum_yy[start_idx]) - sum_y**2 / n
+        corr = np.clip(cov / np.sqrt(var_x * var_y), -1.0, 1.0)
+    corr[counts < min_periods] = np.nan
+
+    window_end = pd.to_datetime(ends)
+    if index.tz is not None:
+        window_end = window_end.tz_localize("UTC").tz_convert(index.tz)
+    return pd.DataFrame(
+        {
+            "window_end": window_end,
+            "correlation": corr,
+            "count": counts,
+        }
+    )
@@ -0,0 +1,290 @@
+"""Incremental (delta) cache for feed DataFrames."""
+
+import threading
+import time
+from functools import partial
+
+import pandas as pd
+
+from config import FEED_DELTA_FULL_REFRESH_SECONDS
+from utils.feed_ingest import concat_feed_frames, project_columns, sort_by_time, time_slice
+from utils.memory_budget import nbytes
+from utils.rollups import FeedRollups
+from utils.swr_cache import in_scope
+
+# Columns identifying a feed row when the backend does not return an "id"
+FEED_ROW_KEY_COLUMNS = ["universe_name", "source", "topic", "feature_name", "created_timestamp", "original_timestamp"]
+
+
+def feed_key(params):
+    """Build a hashable cache key from a dict of feed filter params."""
+    return tuple(sorted((k, v) for k, v in params.items() if v is not None))
+
+
+def covers(covered_from, start):
+    """Whether a frame holding every row from covered_from onwards contains all rows from start onwards."""
+    if covered_from is None:
+        return True
+    return start is not None and covered_from <= start
+
+
+def rows_after(df, since):
+    """
+    Return the rows of an incremental response created after since, without repeats and sorted.
+
+    Only these (usually few) rows are deduplicated and sorted, so they can be appended
+    as is to a sorted frame whose latest created_timestamp is since.
+    """
+    if df is None or df.empty:
+        return df
+    if since is not None:
+        df = df[df["created_timestamp"] > since]
+    subset = ["id"] if "id" in df.columns else [c for c in FEED_ROW_KEY_COLUMNS if c in df.columns]
+    return sort_by_time(df.drop_duplicates(subset=subset, keep="last"))
+
+
+def rows_from(df, start):
+    """Return the rows of df (sorted by created_timestamp) created at or after start."""
+    return time_slice(df, start=start)
+
+
+def _includes(candidate, params, columns):
+    """Whether a frame fetched with the candidate filter params holds every row and column of a params request."""
+    candidate = dict(candidate)
+    candidate_columns = candidate.pop("columns", None)
+    if any(params.get(name) != value for name, value in candidate.items()):
+        return False
+    if candidate_columns is None:
+        return True
+    return columns is not None and set(columns) <= set(candidate_columns.split(","))
+
+
+class DeltaFeedCache:
+    """
+    Keep the last full feed frame per filter key so a refresh only needs rows
+    newer than the last created_timestamp seen.
+
+    Each frame remembers the start of the time range it was fetched for, so a request
+    for a shorter window is answered from a frame covering a longer one, and a request
+    with more filters can be derived from a recently synced frame with fewer. Rollups of
+    a frame are built on first use and then updated with each batch of new rows.
+
+    With a MemoryBudget, frames and rollups are accounted for and the least recently
+    used ones are dropped when over budget (the on-disk cache still holds them).
+    """
+
+    class _Entry:
+        def __init__(self, frame, full_fetched_at, covered_from, synced_at, rollups=None):
+            self.frame = frame
+            self.full_fetched_at = full_fetched_at  # Last full (non-incremental) fetch
+            self.covered_from = covered_from
+            self.synced_at = synced_at  # Last time the frame was confirmed against the backend
+            self.rollups = rollups
+            # Memory sizes, measured once when the entry is stored
+            self.frame_bytes = 0
+            self.rollup_bytes = 0
+
+    def __init__(self, full_refresh_seconds=FEED_DELTA_FULL_REFRESH_SECONDS, budget=None):
+        self.full_refresh_seconds = full_refresh_seconds
+        self.budget = budget
+        self._entries = {}  # key -> _Entry
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and self.budget is not None:
+            self.budget.touch(self, key)
+        return entry
+
+    def _put(self, key, entry):
+        entry.frame_bytes = nbytes(entry.frame)
+        entry.rollup_bytes = nbytes(entry.rollups)
+        with self._lock:
+            self._entries[key] = entry
+        if self.budget is not None:
+            self.budget.add(self, key, entry.frame_bytes + entry.rollup_bytes, partial(self._evict, entry=entry))
+
+    def _evict(self, key, entry):
+        with self._lock:
+            # A concurrent _put may have replaced the entry the budget evicted; keep the new one
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+
+    def has(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def seed(self, key, df, full_fetched_at, covered_from=None, synced_at=0):
+        """Install a previously fetched frame (e.g. from the disk cache) as the base for key."""
+        self._put(key, self._Entry(df, full_fetched_at, covered_from, synced_at))
+
+    def frame(self, key):
+        """Return the full frame cached for key (not a copy), or None."""
+        entry = self._get(key)
+        return entry.frame if entry is not None else None
+
+    def meta(self, key):
+        """Return the bookkeeping of the frame cached for key, or None."""
+        entry = self._get(key)
+        if entry is None:
+            return None
+        return {"full_fetched_at": entry.full_fetched_at, "covered_from": entry.covered_from}
+
+    def cached_rows(self, key, start=None):
+        """
+        Return (rows from start onwards, seconds since the frame was synced) for the frame cached for key.
+
+        Returns None when there is no frame for key or it does not cover start. The rows
+        are a slice of the cached frame, not a copy, so they must not be modified.
+        """
+        entry = self._get(key)
+        if entry is None or not covers(entry.covered_from, start):
+            return None
+        return rows_from(entry.frame, start), time.time() - entry.synced_at
+
+    def plan(self, key, start=None):
+        """
+        Decide how to fetch the rows created at or after start.
+
+        Returns (since, incremental): the timestamp to request rows after, and whether
+        the response only holds rows newer than the cached frame for key.
+        """
+        entry = self._get(key)
+        if entry is None:
+            return start, False
+        df = entry.frame
+        # Periodically resync so backend-side corrections and deletions are picked up
+        stale = time.time() - entry.full_fetched_at > self.full_refresh_seconds
+        if df.empty or stale or not covers(entry.covered_from, start):
+            return start, False
+        return df["created_timestamp"].max(), True
+
+    def merge(self, key, new_rows, since=None, incremental=False, start=None):
+        """
+        Merge newly fetched rows into the cached frame for key and return the rows from start onwards.
+
+        The rows are a slice of the cached frame (see cached_rows). Returns None when an
+        incremental merge finds no base frame for key anymore.
+        """
+        # The backend may ignore "since" and send everything, so filter here as well
+        if incremental:
+            new_rows = rows_after(new_rows, since)
+        elif new_rows is not None and since is not None and not new_rows.empty:
+            new_rows = new_rows[new_rows["created_timestamp"] >= since]
+
+        now = time.time()
+        if not incremental:
+            merged = sort_by_time(new_rows) if new_rows is not None else pd.DataFrame()
+            entry = self._Entry(merged, now, start, now)
+        else:
+            base = self._get(key)
+            if base is None:
+                # Evicted or invalidated while the incremental fetch was in flight; the caller must refetch
+                return None
+            if new_rows is None or new_rows.empty:
+                base.synced_at = now
+                return rows_from(base.frame, start)
+            # Incremental rows are all newer than the base frame (see rows_after), so appending
+            # them keeps it sorted and free of duplicates without touching its rows
+            rollups = base.rollups
+            if rollups is not None:
+                rollups = rollups.update(new_rows)
+            merged = concat_feed_frames([base.frame, new_rows])
+            entry = self._Entry(merged, base.full_fetched_at, base.covered_from, now, rollups)
+
+        self._put(key, entry)
+        return rows_from(merged, start)
+
+    def derive(self, key, start=None, end=None, max_age=0):
+        """
+        Answer a request for key from another cached frame that includes it, or return None.
+
+        Candidates have a subset of key's filters (and all of its columns), cover start and
+        were synced with the backend less than max_age seconds ago; the smallest one is
+        filtered down to key's filters, [start, end] and columns. Nothing is cached for key.
+
+        Returns (rows, candidate key, seconds since the candidate was synced).
+        """
+        params = dict(key)
+        columns = params.pop("columns", None)
+        columns = columns.split(",") if columns is not None else None
+        now = time.time()
+        with self._lock:
+            candidates = [
+                (candidate, entry)
+                for candidate, entry in self._entries.items()
+                if candidate != key
+                and now - entry.synced_at < max_age
+                and covers(entry.covered_from, start)
+                and _includes(candidate, params, columns)
+            ]
+        if not candidates:
+            return None
+        candidate, entry = min(candidates, key=lambda item: len(item[1].frame))
+        if self.budget is not None:
+            self.budget.touch(self, candidate)
+
+        df = time_slice(entry.frame, start=start, end=end)
+        filters = {name: value for name, value in params.items() if name not in dict(candidate)}
+        if any(name not in df.columns for name in filters):
+            return None
+        for name, value in filters.items():
+            df = df[df[name] == value]
+        return project_columns(df, columns).reset_index(drop=True), candidate, now - entry.synced_at
+
+    def rollups(self, key):
+        """Return the FeedRollups of the frame cached for key, building them on first use, or None."""
+        entry = self._get(key)
+        if entry is None:
+            return None
+        if entry.rollups is None:
+            rollups = FeedRollups.from_frame(entry.frame)
+            rollup_bytes = nbytes(rollups)
+            with self._lock:
+                # Keep them only if the entry was not replaced meanwhile
+                current = self._entries.get(key) is entry
+                if current:
+                    entry.rollups, entry.rollup_bytes = rollups, rollup_bytes
+            if current and self.budget is not None:
+                self.budget.add(self, key, entry.frame_bytes + rollup_bytes, partial(self._evict, entry=entry))
+            return rollups
+        return entry.rollups
+
+    def report(self):
+        """Return the row count and memory size (measured when stored) of every cached frame and its rollups, by key."""
+        with self._lock:
+            entries = list(self._entries.items())
+        return [
+            {
+                "key": ", ".join(f"{name}={value}" for name, value in key) or "all",
+                "rows": len(entry.frame),
+                "frame_bytes": entry.frame_bytes,
+                "rollup_bytes": entry.rollup_bytes,
+                "frame": entry.frame,
+            }
+            for key, entry in entries
+        ]
+
+    def expire(self, **scope):
+        """
+        Mark the frames whose filters fall within scope (see swr_cache.in_scope) as not synced.
+
+        The frames are kept, so the next read of each only fetches rows newer than it.
+        With no scope every frame is marked. Returns how many were marked.
+        """
+        with self._lock:
+            entries = [entry for key, entry in self._entries.items() if in_scope(dict(key), scope)]
+            for entry in entries:
+                entry.synced_at = 0
+        return len(entries)
+
+    def invalidate(self, key=None):
+        """Drop one cached frame, or all of them when no key is given."""
+        with self._lock:
+            keys = list(self._entries) if key is None else [key]
+            for k in keys:
+                self._entries.pop(k, None)
+        if self.budget is not None:
+            for k in keys:
+                self.budget.remove(self, k)
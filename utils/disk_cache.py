@@ -0,0 +1,230 @@
+"""Persistent on-disk Parquet cache for feed DataFrames, shared across sessions, workers and restarts."""
+
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+from config import (
+    FEED_DISK_CACHE_DIR,
+    FEED_DISK_CACHE_TTL,
+    FEED_DISK_CACHE_MAX_AGE,
+    FEED_DISK_CACHE_MAX_BYTES,
+    FEED_DISK_CACHE_MAX_SEGMENTS,
+)
+
+_META_KEY = b"sotw_cache_meta"
+
+
+class FeedDiskCache:
+    """
+    Store feed frames as Parquet files keyed by their filter params.
+
+    A frame is a base file plus the segments of rows appended to it by incremental
+    fetches; once there are max_segments of them the caller rewrites the whole frame.
+    The base file's mtime is the last time the frame was confirmed against the backend.
+    Frames younger than ttl_seconds are served without a network call; older ones are
+    only used as a base for incremental fetches until they pass max_age_seconds.
+    The oldest frames are evicted first once the directory exceeds max_bytes.
+    """
+
+    def __init__(
+        self,
+        directory=FEED_DISK_CACHE_DIR,
+        ttl_seconds=FEED_DISK_CACHE_TTL,
+        max_age_seconds=FEED_DISK_CACHE_MAX_AGE,
+        max_bytes=FEED_DISK_CACHE_MAX_BYTES,
+        max_segments=FEED_DISK_CACHE_MAX_SEGMENTS,
+    ):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+        self.max_segments = max_segments
+        self.enabled = PARQUET_AVAILABLE
+        self._lock = threading.Lock()
+        if not PARQUET_AVAILABLE:
+            print("pyarrow is not installed, persistent feed cache disabled")
+
+    @staticmethod
+    def _digest(key):
+        return hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{self._digest(key)}.parquet")
+
+    def _segment_paths(self, key):
+        """Return the appended segment files of key, oldest rows first."""
+        # Segments are named by the timestamp (in ns, zero-padded) their rows follow
+        return sorted(glob.glob(os.path.join(self.directory, f"{self._digest(key)}.*.delta.parquet")))
+
+    def load(self, key):
+        """
+        Load the cached frame for key.
+
+        Returns (df, meta, is_fresh), or (None, None, False) when nothing usable is cached.
+        meta is the dict passed to store().
+        """
+        if not self.enabled:
+            return None, None, False
+        path = self._path(key)
+        try:
+            age = time.time() - os.path.getmtime(path)
+            table = pq.read_table(path)
+            metadata = table.schema.metadata or {}
+            meta = json.loads(metadata.get(_META_KEY, b"{}"))
+            df = table.to_pandas()
+            segments = [pq.read_table(segment_path).to_pandas() for segment_path in self._segment_paths(key)]
+            if segments:
+                df = self._apply_segments(df, segments)
+            return df, meta, age < self.ttl_seconds
+        except FileNotFoundError:
+            return None, None, False
+        except Exception as e:
+            print(f"Error reading feed cache file {path}: {e}")
+            return None, None, False
+
+    def store(self, key, df, meta):
+        """Write a frame and its JSON-serializable meta dict for key atomically, then enforce the size budget."""
+        if not self.enabled or df is None:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            metadata[_META_KEY] = json.dumps(meta).encode("utf-8")
+            pq.write_table(table.replace_schema_metadata(metadata), tmp_path)
+            # os.replace is atomic, so concurrent readers in other workers never see a partial file
+            os.replace(tmp_path, path)
+            # The frame includes the rows of any earlier segments
+            for segment_path in self._segment_paths(key):
+                self._remove(segment_path)
+        except Exception as e:
+            print(f"Error writing feed cache file {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self.evict()
+
+    @staticmethod
+    def _apply_segments(df, segments):
+        # Workers syncing from different bases may write overlapping segments, so each one
+        # only contributes the rows newer than everything before it
+        frames = [df]
+        latest = df["created_timestamp"].max() if not df.empty else None
+        for segment in segments:
+            if latest is not None:
+                segment = segment[segment["created_timestamp"] > latest]
+            if not segment.empty:
+                frames.append(segment)
+                latest = segment["created_timestamp"].max()
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else df
+
+    def append(self, key, new_rows, since):
+        """
+        Add rows created after since (the latest created_timestamp of the stored frame) to key's frame.
+
+        Only the new rows are written, as a segment file. Returns False without writing when
+        there is no stored frame or it already has max_segments segments; the caller then
+        stores the whole frame, which folds the segments back into one file.
+        """
+        if not self.enabled:
+            return True
+        path = self._path(key)
+        if not os.path.exists(path) or len(self._segment_paths(key)) >= self.max_segments:
+            return False
+        segment_path = os.path.join(self.directory, f"{self._digest(key)}.{since.value:020d}.delta.parquet")
+        tmp_path = f"{segment_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            pq.write_table(pa.Table.from_pandas(new_rows, preserve_index=False), tmp_path)
+            os.replace(tmp_path, segment_path)
+        except Exception as e:
+            print(f"Error writing feed cache file {segment_path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+        self.touch(key)
+        return True
+
+    def touch(self, key):
+        """Mark the cached frame for key as confirmed up to date."""
+        if not self.enabled:
+            return
+        try:
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def invalidate(self, key=None):
+        """Delete one cached file, or the whole cache when no key is given."""
+        if not self.enabled:
+            return
+        if key is not None:
+            paths = [self._path(key)] + self._segment_paths(key)
+        else:
+            paths = [entry.path for entry in self._entries()]
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _entries(self):
+        try:
+            return [entry for entry in os.scandir(self.directory) if entry.name.endswith(".parquet")]
+        except FileNotFoundError:
+            return []
+
+    def evict(self):
+        """Remove expired frames, then the least recently refreshed ones until under max_bytes."""
+        with self._lock:
+            now = time.time()
+            frames = {}  # digest -> [base file mtime, total size, paths]
+            for entry in self._entries():
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                frame = frames.setdefault(entry.name.split(".", 1)[0], [None, 0, []])
+                if not entry.name.endswith(".delta.parquet"):
+                    frame[0] = stat.st_mtime
+                frame[1] += stat.st_size
+                frame[2].append(entry.path)
+
+            kept = []
+            for mtime, size, paths in frames.values():
+                # Segments left without their base file are unusable
+                if mtime is None or now - mtime > self.max_age_seconds:
+                    for path in paths:
+                        self._remove(path)
+                else:
+                    kept.append((mtime, size, paths))
+
+            total = sum(size for _, size, _ in kept)
+            for _, size, paths in sorted(kept, key=lambda frame: frame[0]):
+                if total <= self.max_bytes:
+                    break
+                for path in paths:
+                    self._remove(path)
+                total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,92 @@
+"""Downsampling of time series for plotting."""
+
+import numpy as np
+import pandas as pd
+
+
+def minmax_indices(y, n_buckets):
+    """Return the indices of the min and max of y in each of n_buckets equal-sized buckets, plus the endpoints."""
+    n = len(y)
+    bucket_size = int(np.ceil(n / n_buckets))
+    padded = np.full(bucket_size * int(np.ceil(n / bucket_size)), np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(-1, bucket_size)
+    offsets = np.arange(buckets.shape[0]) * bucket_size
+    indices = np.concatenate(
+        [[0, n - 1], offsets + np.nanargmin(buckets, axis=1), offsets + np.nanargmax(buckets, axis=1)]
+    )
+    return np.unique(indices)
+
+
+def lttb_indices(x, y, n_out):
+    """Return the indices of n_out points chosen by Largest-Triangle-Three-Buckets."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # n_out - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        # Pick the point forming the largest triangle with the previous pick and the next bucket's average
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+def downsample_indices(x, y, n_out):
+    """
+    Pick at most n_out indices of a series sorted by x, preserving its shape and extremes.
+
+    Long series are first reduced to per-bucket minima and maxima, so LTTB only runs
+    over a few candidates per output point. LTTB itself may skip an extreme, so it
+    picks n_out - 2 points and the global minimum and maximum are always added back.
+    """
+    n = len(x)
+    if n <= n_out:
+        return np.arange(n)
+    extremes = np.unique([np.nanargmin(y), np.nanargmax(y)])
+    if n_out < 5:
+        return extremes[:n_out]
+    candidates = np.arange(n)
+    if n > 4 * n_out:
+        candidates = minmax_indices(y, 2 * n_out)
+    picks = candidates[lttb_indices(x[candidates], y[candidates], n_out - 2)]
+    return np.union1d(picks, extremes)
+
+
+def downsample_frame(df, x_col, y_col, max_points, group_col=None):
+    """
+    Downsample a frame sorted by x_col to at most max_points rows per group (plot trace).
+
+    x_col must be numeric or datetime and y_col numeric; rows with a missing y are dropped.
+    """
+    df = df.dropna(subset=[y_col])
+    if df.empty or max_points is None:
+        return df
+
+    groups = df.groupby(group_col, observed=True, sort=False).indices.values() if group_col else [np.arange(len(df))]
+    selected = []
+    for positions in groups:
+        if len(positions) <= max_points:
+            selected.append(positions)
+            continue
+        part = df.iloc[positions]
+        if pd.api.types.is_datetime64_any_dtype(part[x_col]):
+            x = pd.DatetimeIndex(part[x_col]).asi8.astype(np.float64)
+        else:
+            x = part[x_col].to_numpy(dtype=np.float64)
+        y = part[y_col].to_numpy(dtype=np.float64)
+        selected.append(positions[downsample_indices(x, y, max_points)])
+
+    if not selected:
+        return df
+    return df.iloc[np.sort(np.concatenate(selected))]
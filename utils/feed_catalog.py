@@ -0,0 +1,98 @@
+"""Catalog of the distinct feeds (source, topic, feature_name) of a universe, used to populate selectors."""
+
+import pandas as pd
+import streamlit as st
+from utils import perf
+from utils.api_client import APIClient
+from utils.feed_ingest import NUMERIC_VALUE_COLUMN
+
+# One catalog row per feed series
+CATALOG_KEY_COLUMNS = ["source", "topic", "feature_name"]
+CATALOG_FIELDS = CATALOG_KEY_COLUMNS + ["feature_is_target", "first_timestamp", "last_timestamp", "row_count"]
+# Feed columns needed to derive the catalog when the backend has no catalog endpoint
+CATALOG_FEED_COLUMNS = ("source", "topic", "feature_name", "feature_is_target")
+
+
+def catalog_from_feed(df):
+    """
+    Derive catalog rows from feed rows (at least CATALOG_FEED_COLUMNS and created_timestamp).
+
+    Frames with parsed feature values also get a numeric_count column: the rows with a numeric value.
+    """
+    if df is None or df.empty:
+        return pd.DataFrame(columns=CATALOG_FIELDS)
+
+    aggregations = {
+        "first_timestamp": ("created_timestamp", "min"),
+        "last_timestamp": ("created_timestamp", "max"),
+        "row_count": ("created_timestamp", "count"),
+    }
+    if NUMERIC_VALUE_COLUMN in df.columns:
+        aggregations["numeric_count"] = (NUMERIC_VALUE_COLUMN, "count")
+    if "feature_is_target" in df.columns:
+        aggregations["feature_is_target"] = ("feature_is_target", "any")
+    catalog = df.groupby(CATALOG_KEY_COLUMNS, observed=True).agg(**aggregations).reset_index()
+    return catalog
+
+
+class FeedCatalog:
+    """The feeds of a universe with their first/last timestamp and row count, without any row data."""
+
+    def __init__(self, catalog):
+        catalog = pd.DataFrame(columns=CATALOG_FIELDS) if catalog is None else catalog.copy()
+        for col in CATALOG_KEY_COLUMNS:
+            catalog[col] = catalog[col].astype(str) if col in catalog.columns else pd.Series(dtype=str)
+        if "feature_is_target" in catalog.columns:
+            catalog["feature_is_target"] = catalog["feature_is_target"].fillna(False).astype(bool)
+        else:
+            catalog["feature_is_target"] = False
+        if "row_count" not in catalog.columns:
+            catalog["row_count"] = 0
+        self._catalog = catalog.sort_values(CATALOG_KEY_COLUMNS).reset_index(drop=True)
+
+    @property
+    def empty(self):
+        return self._catalog.empty
+
+    def frame(self, source=None, topic=None):
+        """Return the catalog rows, optionally restricted to a source and/or topic."""
+        catalog = self._catalog
+        if source is not None:
+            catalog = catalog[catalog["source"] == str(source)]
+        if topic is not None:
+            catalog = catalog[catalog["topic"] == str(topic)]
+        return catalog.copy()
+
+    def sources(self, topic=None):
+        return sorted(self.frame(topic=topic)["source"].unique().tolist())
+
+    def topics(self, source=None):
+        return sorted(self.frame(source=source)["topic"].unique().tolist())
+
+    def features(self, source=None, topic=None):
+        return sorted(self.frame(source=source, topic=topic)["feature_name"].unique().tolist())
+
+    def features_by_source(self):
+        return {source: self.features(source=source) for source in self.sources()}
+
+    def targets(self, topic=None):
+        """Return the (source, feature_name) catalog rows flagged as target variables."""
+        catalog = self.frame(topic=topic)
+        return catalog[catalog["feature_is_target"]]
+
+
+@st.cache_resource(ttl=300, max_entries=64)  # Cached apart from the feed stores, refreshed with the feed cache
+def get_feed_catalog(universe_name):
+    """
+    Load the feed catalog of a universe.
+
+    Uses the backend's catalog endpoint when available; otherwise the catalog is derived
+    from a feed fetch projected to CATALOG_FEED_COLUMNS.
+    """
+    catalog = APIClient.get_feed_catalog(universe_name=universe_name)
+    perf.count("feed_catalog", "derived" if catalog is None else "endpoint")
+    if catalog is None:
+        catalog = catalog_from_feed(
+            APIClient.get_feed_from_db(universe_name=universe_name, columns=CATALOG_FEED_COLUMNS)
+        )
+    return FeedCatalog(catalog)
@@ -0,0 +1,154 @@
+"""Ingestion of backend feed rows into compact, time-sorted DataFrames with normalized, tz-aware UTC timestamps."""
+
+import pandas as pd
+
+from config import FEED_TIMESTAMP_FORMAT
+from utils import perf
+
+# Feed columns holding timestamps; after ingestion they are datetime64[ns, UTC]
+TIMESTAMP_COLUMNS = ["created_timestamp", "original_timestamp"]
+TIMESTAMP_DTYPE = pd.DatetimeTZDtype("ns", "UTC")
+# Repeated string columns stored as categoricals
+CATEGORICAL_COLUMNS = ["universe_name", "source", "topic", "topic_category", "feature_name", "feature_category"]
+BOOLEAN_COLUMNS = ["feature_is_target"]
+# feature_value holds numbers and text; its numbers are parsed once into this float64 column (NaN for text)
+NUMERIC_VALUE_COLUMN = "feature_numeric"
+
+
+def utc_now():
+    """Return the current time as a tz-aware UTC Timestamp."""
+    return pd.Timestamp.now(tz="UTC")
+
+
+def to_utc(value):
+    """Convert a timestamp-like value to a tz-aware UTC Timestamp; naive values are taken to be UTC."""
+    if value is None:
+        return None
+    ts = pd.Timestamp(value)
+    if ts is pd.NaT:
+        return ts
+    return ts.tz_localize("UTC") if ts.tz is None else ts.tz_convert("UTC")
+
+
+def parse_timestamps(values):
+    """
+    Parse a column of timestamps to datetime64[ns, UTC].
+
+    Strings are parsed with FEED_TIMESTAMP_FORMAT in one vectorized pass, falling back to
+    general ISO 8601 parsing when any value has another layout. Already parsed columns are
+    only converted (naive values are taken to be UTC).
+    """
+    if isinstance(values.dtype, pd.DatetimeTZDtype) or pd.api.types.is_datetime64_dtype(values.dtype):
+        parsed = values if values.dt.tz is not None else values.dt.tz_localize("UTC")
+    else:
+        try:
+            parsed = pd.to_datetime(values, format=FEED_TIMESTAMP_FORMAT, utc=True)
+        except (ValueError, TypeError):
+            parsed = pd.to_datetime(values, format="ISO8601", utc=True)
+    return parsed.astype(TIMESTAMP_DTYPE)
+
+
+def normalize_feed_frame(df, columns=TIMESTAMP_COLUMNS):
+    """Return df with its timestamp columns as datetime64[ns, UTC] (a no-op for already normalized frames)."""
+    if df is None:
+        return None
+    to_convert = [col for col in columns if col in df.columns and df[col].dtype != TIMESTAMP_DTYPE]
+    if not to_convert:
+        return df
+    df = df.copy()
+    for col in to_convert:
+        df[col] = parse_timestamps(df[col])
+    return df
+
+
+def compact_feed_frame(df):
+    """
+    Return df with the ingestion schema: categorical repeated strings, bool flags and feature_value's
+    numbers parsed into NUMERIC_VALUE_COLUMN (a no-op for already compact frames).
+
+    float64 rather than float32 keeps prices and other values with many significant digits exact.
+    """
+    if df is None:
+        return None
+    to_categorical = [
+        col for col in CATEGORICAL_COLUMNS if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype)
+    ]
+    to_bool = [col for col in BOOLEAN_COLUMNS if col in df.columns and df[col].dtype != bool]
+    add_numeric = "feature_value" in df.columns and NUMERIC_VALUE_COLUMN not in df.columns
+    if not (to_categorical or to_bool or add_numeric):
+        return df
+
+    df = df.copy()
+    for col in to_categorical:
+        df[col] = df[col].astype("category")
+    for col in to_bool:
+        df[col] = df[col].fillna(False).astype(bool)
+    if add_numeric:
+        df[NUMERIC_VALUE_COLUMN] = pd.to_numeric(df["feature_value"], errors="coerce").astype("float64")
+    return df
+
+
+def numeric_feature_values(df):
+    """Return the feature values of df as float64, NaN where not numeric, reusing the ingestion-time parse."""
+    if NUMERIC_VALUE_COLUMN in df.columns:
+        return df[NUMERIC_VALUE_COLUMN]
+    return pd.to_numeric(df["feature_value"], errors="coerce")
+
+
+def concat_feed_frames(frames):
+    """Concatenate feed frames, keeping categorical columns categorical by aligning their categories."""
+    frames = [df for df in frames if df is not None]
+    for col in CATEGORICAL_COLUMNS:
+        dtypes = [df[col].dtype for df in frames if col in df.columns]
+        if len(dtypes) < 2 or not all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes):
+            continue
+        categories = dtypes[0].categories
+        for dtype in dtypes[1:]:
+            categories = categories.append(dtype.categories.difference(categories))
+        # Appending keeps the existing codes valid, and frames that already match are left alone
+        frames = [
+            df.assign(**{col: df[col].cat.set_categories(categories)})
+            if col in df.columns and not df[col].cat.categories.equals(categories)
+            else df
+            for df in frames
+        ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def project_columns(df, columns):
+    """Return df restricted to columns (those it has), keeping the parsed numbers along with feature_value."""
+    if df is None or columns is None:
+        return df
+    if "feature_value" in columns:
+        columns = list(columns) + [NUMERIC_VALUE_COLUMN]
+    return df[[col for col in dict.fromkeys(columns) if col in df.columns]]
+
+
+def sort_by_time(df, column="created_timestamp"):
+    """Return df ordered by column (stable), leaving already sorted frames untouched."""
+    if df is None or column not in df.columns or df[column].is_monotonic_increasing:
+        return df
+    return df.sort_values(column, kind="stable", ignore_index=True)
+
+
+def time_slice(df, start=None, end=None, column="created_timestamp"):
+    """
+    Return the rows of a frame sorted by column with start <= column <= end.
+
+    Bounds are found by binary search and the result is a positional slice of df rather than
+    a masked copy, so any window, fixed or custom, costs O(log n). Either bound may be None.
+    """
+    if df is None or df.empty or (start is None and end is None):
+        return df
+    values = df[column]
+    lo = 0 if start is None else values.searchsorted(to_utc(start), side="left")
+    hi = len(df) if end is None else values.searchsorted(to_utc(end), side="right")
+    return df.iloc[lo:hi]
+
+
+@perf.timed("ingest.feed_frame_from_records")
+def feed_frame_from_records(data):
+    """Build a feed DataFrame sorted by created_timestamp from the backend's list of row dicts, or None."""
+    if not data:
+        return None
+    return sort_by_time(compact_feed_frame(normalize_feed_frame(pd.DataFrame(data))))
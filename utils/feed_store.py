@@ -0,0 +1,205 @@
+"""In-memory indexed store for a universe's feed data."""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils import perf
+from utils.api_client import APIClient, FEED_NAMESPACE
+from utils.feed_catalog import FeedCatalog, catalog_from_feed, get_feed_catalog
+from utils.feed_ingest import TIMESTAMP_DTYPE, compact_feed_frame, sort_by_time, to_utc
+from utils.rollups import pick_rollup_frequency
+
+# Series keys of the index; within a series rows are ordered by created_timestamp
+INDEX_KEYS = ["source", "topic", "feature_name"]
+
+
+def _key_codes(values):
+    """Return integer codes for a key column, reusing categorical codes."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy()
+    return pd.factorize(values)[0]
+
+
+class FeedStore:
+    """
+    A universe's feed loaded once and indexed by (source, topic, feature_name, created_timestamp).
+
+    The index is a positional permutation grouping the rows of each series, in time order,
+    plus a small table of where each series starts and ends in it. The frame itself is not
+    copied (it may be the API client's cached frame, so it is never modified), and slices
+    by any combination of source/topic/feature and a time range are resolved with binary
+    searches instead of full boolean masks.
+    """
+
+    def __init__(self, df, rollups=None):
+        if df is None or df.empty:
+            df = pd.DataFrame(columns=INDEX_KEYS + ["created_timestamp"])
+            df["created_timestamp"] = df["created_timestamp"].astype(TIMESTAMP_DTYPE)
+
+        self._df = df = sort_by_time(compact_feed_frame(df))
+
+        # A stable sort by series keeps each series' rows in time order
+        codes = [_key_codes(df[col]) for col in INDEX_KEYS]
+        self._order = np.lexsort(codes[::-1])
+        self._times = pd.DatetimeIndex(df["created_timestamp"]).asi8[self._order]
+        sorted_codes = np.column_stack([code[self._order] for code in codes])
+        changes = np.flatnonzero((sorted_codes[1:] != sorted_codes[:-1]).any(axis=1)) + 1
+        bounds = np.r_[0, changes, len(df)] if len(df) else np.zeros(1, dtype=np.int64)
+        first_rows = df.iloc[self._order[bounds[:-1]]]
+        self._series = pd.DataFrame({col: first_rows[col].astype(str).to_numpy() for col in INDEX_KEYS})
+        self._series["start"] = bounds[:-1]
+        self._series["end"] = bounds[1:]
+
+        self._catalog = FeedCatalog(catalog_from_feed(df))
+        self._rollups = rollups
+
+    @property
+    def empty(self):
+        return self._df.empty
+
+    def catalog(self):
+        """Return the catalog of the feeds held in this store."""
+        return self._catalog
+
+    def slice(self, source=None, topic=None, feature_name=None, start=None, end=None):
+        """
+        Return the rows matching the given keys and created_timestamp range [start, end].
+
+        Any key left as None matches all values.
+        """
+        series = self._series
+        for col, value in zip(INDEX_KEYS, (source, topic, feature_name)):
+            if value is not None:
+                series = series[series[col] == str(value)]
+
+        start = to_utc(start).value if start is not None else None
+        end = to_utc(end).value if end is not None else None
+        positions = []
+        for first, last in zip(series["start"], series["end"]):
+            times = self._times[first:last]
+            lo = first + (times.searchsorted(start, side="left") if start is not None else 0)
+            hi = first + (times.searchsorted(end, side="right") if end is not None else len(times))
+            positions.append(self._order[lo:hi])
+        positions = np.concatenate(positions) if positions else np.empty(0, dtype=np.intp)
+        return self._df.iloc[positions].reset_index(drop=True)
+
+    def rollup_frequency(
+        self, source=None, topic=None, feature_name=None, start=None, end=None, min_points=1, max_frequency=None
+    ):
+        """
+        Pick the coarsest rollup frequency that still gives min_points buckets over the matching series.
+
+        Returns None when raw rows should be used: no rollups are available, no frequency
+        qualifies, or the series have no more numeric rows (the only ones rolled up) than
+        the rollup would have buckets.
+        """
+        if self._rollups is None:
+            return None
+        catalog = self._catalog.frame(source=source, topic=topic)
+        if feature_name is not None:
+            catalog = catalog[catalog["feature_name"] == str(feature_name)]
+        if catalog.empty:
+            return None
+
+        first = catalog["first_timestamp"].min()
+        last = catalog["last_timestamp"].max()
+        if start is not None:
+            first = max(first, to_utc(start))
+        if end is not None:
+            last = min(last, to_utc(end))
+        if last <= first:
+            return None
+        frequency = pick_rollup_frequency(first, last, min_points, max_frequency)
+        if frequency is None:
+            return None
+        # Only use the rollup when it has fewer buckets than the raw rows expected in the window
+        buckets = len(catalog) * ((last - first) / pd.Timedelta(frequency) + 1)
+        series_span = (catalog["last_timestamp"] - catalog["first_timestamp"]).clip(lower=pd.Timedelta(1))
+        numeric_rows = catalog["numeric_count"] if "numeric_count" in catalog.columns else 0
+        window_rows = (numeric_rows * ((last - first) / series_span).clip(upper=1)).sum()
+        return frequency if window_rows > buckets else None
+
+    def is_numeric(self, source=None, topic=None, feature_name=None):
+        """Whether every row of the matching series has a numeric feature value."""
+        catalog = self._catalog.frame(source=source, topic=topic)
+        if feature_name is not None:
+            catalog = catalog[catalog["feature_name"] == str(feature_name)]
+        if catalog.empty or "numeric_count" not in catalog.columns:
+            return False
+        return bool((catalog["numeric_count"] == catalog["row_count"]).all())
+
+    def rollup_slice(self, frequency, source=None, topic=None, feature_name=None, start=None, end=None):
+        """Return the rollup buckets of the matching series in [start, end] (see FeedRollups.slice)."""
+        return self._rollups.slice(frequency, source, topic, feature_name, start, end)
+
+
+FEED_STORE_TTL = 300  # Seconds a store is kept, in step with the feed cache
+
+# (universe_name, since, columns) -> build time of the stores that may still be cached, for
+# per-universe invalidation. Stores expire FEED_STORE_TTL after being built, so older keys are pruned.
+_store_keys = {}
+_store_keys_lock = threading.Lock()
+
+
+def _prune_store_keys(now):
+    expired = [key for key, built_at in _store_keys.items() if now - built_at >= FEED_STORE_TTL]
+    for key in expired:
+        del _store_keys[key]
+
+
+@st.cache_resource(ttl=FEED_STORE_TTL, max_entries=32)  # Shared across sessions, refreshed with the feed cache
+def _load_feed_store(universe_name, since, columns):
+    # Index the API client's cached frame rather than a copy of it
+    df = APIClient.get_feed_from_db(universe_name=universe_name, since=since, columns=columns, copy=False)
+    # Only runs on a cache_resource miss, so the timer's count is the number of store builds
+    with perf.timer("feed_store.build"):
+        store = FeedStore(df, rollups=APIClient.get_feed_rollups(universe_name=universe_name, columns=columns))
+    # Recorded once built, as the cache's TTL starts when the store is returned
+    now = time.time()
+    with _store_keys_lock:
+        _prune_store_keys(now)
+        _store_keys[(universe_name, since, columns)] = now
+    return store
+
+
+def get_feed_store(universe_name, since=None, columns=None):
+    """
+    Load and index the feed of a universe.
+
+    since limits the load to rows created from then on and columns projects it.
+    Use get_feed_catalog when only selectors need to be populated.
+    """
+    # Always called positionally so entries can be cleared by the same arguments
+    return _load_feed_store(universe_name, since, columns)
+
+
+def clear_feed_stores(universe_name=None):
+    """Drop the cached stores of one universe, or all of them when no universe is given."""
+    if universe_name is None:
+        _load_feed_store.clear()
+        with _store_keys_lock:
+            _store_keys.clear()
+        return
+    with _store_keys_lock:
+        _prune_store_keys(time.time())
+        keys = [key for key in _store_keys if key[0] == universe_name]
+        for key in keys:
+            del _store_keys[key]
+    for key in keys:
+        _load_feed_store.clear(*key)
+
+
+def refresh_universe_feeds(universe_name):
+    """
+    Make the next reads of a universe's feed, catalog and stores go to the backend.
+
+    Only that universe's entries are dropped; other universes, the universe list and the news
+    stay cached for everyone. Incremental base frames are kept, so the refetch only
+    transfers rows newer than them.
+    """
+    APIClient.invalidate_cache(FEED_NAMESPACE, universe_name=universe_name)
+    clear_feed_stores(universe_name)
+    get_feed_catalog.clear(universe_name)
@@ -1,7 +1,8 @@
 """Utility functions for time-related operations."""
 
-import pandas as pd
-from datetime import datetime, timedelta
+from datetime import timedelta
+from config import FEED_WINDOW_GRANULARITY
+from utils.feed_ingest import time_slice, to_utc, utc_now
 
 # Time window constants
 TIME_WINDOW_ALL = "All Time"
@@ -14,28 +15,50 @@ TIME_WINDOW_MONTH = "Last Month"
 TIME_WINDOW_OPTIONS = [TIME_WINDOW_ALL, TIME_WINDOW_HOUR, TIME_WINDOW_DAY, TIME_WINDOW_WEEK, TIME_WINDOW_MONTH]
 
 
-def filter_dataframe_by_time(df, time_window):
-    if df is None or df.empty or time_window == TIME_WINDOW_ALL:
-        return df
-
-    now = datetime.utcnow()
+def get_time_window_start(time_window):
+    """Get the cutoff for a time window as a tz-aware UTC Timestamp, or None when it covers all time."""
+    now = utc_now()
 
     if time_window == TIME_WINDOW_HOUR:
-        cutoff = now - timedelta(hours=1)
+        return now - timedelta(hours=1)
     elif time_window == TIME_WINDOW_DAY:
-        cutoff = now - timedelta(days=1)
+        return now - timedelta(days=1)
     elif time_window == TIME_WINDOW_WEEK:
-        cutoff = now - timedelta(weeks=1)
+        return now - timedelta(weeks=1)
     elif time_window == TIME_WINDOW_MONTH:
-        cutoff = now - timedelta(days=30)
-    else:
-        # Unknown time window, return original dataframe
+        return now - timedelta(days=30)
+    # All time or unknown time window
+    return None
+
+
+def get_time_window_fetch_start(time_window):
+    """
+    Get the cutoff to request from the backend for a time window.
+
+    The cutoff is floored to FEED_WINDOW_GRANULARITY so fetches on consecutive reruns
+    share cache keys; apply get_time_window_start to the result for the exact window.
+    """
+    start = get_time_window_start(time_window)
+    if start is None:
+        return None
+    return start.floor(f"{FEED_WINDOW_GRANULARITY}s")
+
+
+def filter_dataframe_by_time(df, time_window=TIME_WINDOW_ALL, start=None, end=None):
+    """
+    Return the rows of a frame sorted by created_timestamp that fall in a time window.
+
+    start/end give a custom range instead; when time_window is also set the later start applies.
+    """
+    if df is None or df.empty:
         return df
 
-    if not pd.api.types.is_datetime64_any_dtype(df["created_timestamp"]):
-        df["created_timestamp"] = pd.to_datetime(df["created_timestamp"])
+    window_start = get_time_window_start(time_window)
+    if window_start is not None and (start is None or to_utc(start) < window_start):
+        start = window_start
 
-    return df[df["created_timestamp"] >= cutoff]
+    # created_timestamp is parsed to UTC and sorted once at ingestion (see utils.feed_ingest)
+    return time_slice(df, start=start, end=end)
 
 
 def get_topic_description(universe, topic_name):
@@ -0,0 +1,62 @@
+"""Shared, pooled HTTP session used for all backend calls."""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils import perf
+
+from config import (
+    API_BASE_URL,
+    API_POOL_CONNECTIONS,
+    API_POOL_MAXSIZE,
+    API_CONNECT_TIMEOUT,
+    API_READ_TIMEOUT,
+    API_ENDPOINT_TIMEOUTS,
+)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the process-wide keep-alive session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=API_POOL_CONNECTIONS,
+                    pool_maxsize=API_POOL_MAXSIZE,
+                    pool_block=False,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+                _session = session
+    return _session
+
+
+def get_timeout(path):
+    """Get the (connect, read) timeout for an endpoint path."""
+    matches = [prefix for prefix in API_ENDPOINT_TIMEOUTS if path.startswith(prefix)]
+    if matches:
+        return API_ENDPOINT_TIMEOUTS[max(matches, key=len)]
+    return (API_CONNECT_TIMEOUT, API_READ_TIMEOUT)
+
+
+def request(method, path, **kwargs):
+    """Send a request to the backend through the shared session."""
+    kwargs.setdefault("timeout", get_timeout(path))
+    with perf.timer(f"http {method} {path}"):
+        return get_session().request(method, f"{API_BASE_URL}{path}", **kwargs)
+
+
+def get(path, **kwargs):
+    return request("GET", path, **kwargs)
+
+
+def post(path, **kwargs):
+    return request("POST", path, **kwargs)
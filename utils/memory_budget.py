@@ -0,0 +1,85 @@
+"""Byte budget shared by in-memory caches, with least-recently-used eviction across all of them."""
+
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def nbytes(value):
+    """Return the memory held by a cached value: DataFrames (incl. in tuples) are counted, anything else is 0."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    if isinstance(value, (tuple, list)):
+        return sum(nbytes(item) for item in value)
+    if hasattr(value, "nbytes") and not isinstance(value, type):
+        return int(value.nbytes)
+    return 0
+
+
+def memory_report(df):
+    """Return the dtype and deep memory size of each column of df (and its index), largest first."""
+    sizes = df.memory_usage(deep=True, index=True)
+    dtypes = df.dtypes.astype(str).reindex(sizes.index, fill_value=type(df.index).__name__)
+    report = pd.DataFrame({"dtype": dtypes, "bytes": sizes})
+    report["share"] = report["bytes"] / max(int(sizes.sum()), 1)
+    return report.sort_values("bytes", ascending=False)
+
+
+class MemoryBudget:
+    """
+    Track the size of entries held by several caches and keep their total under max_bytes.
+
+    Caches register each entry with its size and an eviction callback, and touch it
+    on every use. When the total exceeds max_bytes the least recently used entries are
+    evicted, whichever cache they belong to; the entry just added is never evicted.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # (owner id, key) -> (size, evict callback)
+        self._total = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def add(self, owner, key, size, evict):
+        """Register (or resize) an entry as the most recently used; evict(key) is called if it gets evicted."""
+        entry_key = (id(owner), key)
+        with self._lock:
+            previous = self._entries.pop(entry_key, None)
+            if previous is not None:
+                self._total -= previous[0]
+            self._entries[entry_key] = (size, evict)
+            self._total += size
+
+            victims = []
+            while self._total > self.max_bytes and len(self._entries) > 1:
+                (_, victim_key), (victim_size, victim_evict) = self._entries.popitem(last=False)
+                self._total -= victim_size
+                self._evictions += 1
+                victims.append((victim_evict, victim_key))
+
+        # Callbacks take their cache's lock, so run them outside ours
+        for victim_evict, victim_key in victims:
+            victim_evict(victim_key)
+
+    def touch(self, owner, key):
+        with self._lock:
+            entry_key = (id(owner), key)
+            if entry_key in self._entries:
+                self._entries.move_to_end(entry_key)
+
+    def remove(self, owner, key):
+        with self._lock:
+            entry = self._entries.pop((id(owner), key), None)
+            if entry is not None:
+                self._total -= entry[0]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+                "entries": len(self._entries),
+                "evictions": self._evictions,
+            }
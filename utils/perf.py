@@ -0,0 +1,141 @@
+"""Latency and cache hit/miss instrumentation shared by the API client, plots and UI."""
+
+import functools
+import inspect
+import json
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+import numpy as np
+import streamlit as st
+
+from config import PERF_HISTOGRAM_BUCKETS_MS, PERF_MAX_EVENTS, PERF_MAX_SAMPLES
+
+
+class _TimerStats:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(PERF_HISTOGRAM_BUCKETS_MS) + 1)  # Last bucket: above the largest bound
+        self.samples = deque(maxlen=PERF_MAX_SAMPLES)  # Recent durations, for percentiles
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.buckets[int(np.searchsorted(PERF_HISTOGRAM_BUCKETS_MS, seconds * 1000))] += 1
+        self.samples.append(seconds)
+
+    def summary(self):
+        samples_ms = np.array(self.samples) * 1000
+        labels = [f"<={bound}ms" for bound in PERF_HISTOGRAM_BUCKETS_MS] + [f">{PERF_HISTOGRAM_BUCKETS_MS[-1]}ms"]
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000,
+            "p50_ms": float(np.percentile(samples_ms, 50)),
+            "p95_ms": float(np.percentile(samples_ms, 95)),
+            "max_ms": self.max * 1000,
+            "histogram": dict(zip(labels, self.buckets)),
+        }
+
+
+class PerfRecorder:
+    """
+    Collect named durations into latency histograms and named outcome counters (e.g. cache hits).
+
+    The most recent PERF_MAX_EVENTS measurements are also kept as individual events for export.
+    """
+
+    def __init__(self):
+        self._timers = {}
+        self._counters = {}
+        self._events = deque(maxlen=PERF_MAX_EVENTS)
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self._lock:
+            self._timers.setdefault(name, _TimerStats()).add(seconds)
+            self._events.append({"time": time.time(), "type": "timer", "name": name, "ms": seconds * 1000})
+
+    def count(self, name, outcome):
+        with self._lock:
+            self._counters.setdefault(name, Counter())[outcome] += 1
+            self._events.append({"time": time.time(), "type": "counter", "name": name, "outcome": outcome})
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed(self, name=None):
+        """
+        Decorate a function so every call is recorded under name (default: its qualified name).
+
+        Coroutine functions are timed until their result is awaited.
+        """
+
+        def decorator(func):
+            label = name or func.__qualname__
+
+            if inspect.iscoroutinefunction(func):
+
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.timer(label):
+                        return await func(*args, **kwargs)
+
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(label):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def snapshot(self):
+        """Return the current timer summaries and counters."""
+        with self._lock:
+            return {
+                "timers": {name: stats.summary() for name, stats in sorted(self._timers.items())},
+                "counters": {name: dict(counts) for name, counts in sorted(self._counters.items())},
+            }
+
+    def export_json(self):
+        """Return the summaries plus the recent individual events as a JSON document."""
+        data = self.snapshot()
+        with self._lock:
+            data["events"] = list(self._events)
+        data["exported_at"] = time.time()
+        return json.dumps(data, indent=2)
+
+    def reset(self):
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+            self._events.clear()
+
+
+# Process-wide recorder; module-level helpers below delegate to it
+_recorder = PerfRecorder()
+record = _recorder.record
+count = _recorder.count
+timer = _recorder.timer
+timed = _recorder.timed
+snapshot = _recorder.snapshot
+export_json = _recorder.export_json
+reset = _recorder.reset
+
+
+def plotly_chart(fig, **kwargs):
+    """Render a figure with st.plotly_chart, recording the time spent serializing it for the browser."""
+    with timer("render.plotly_chart"):
+        return st.plotly_chart(fig, **kwargs)
@@ -1,15 +1,28 @@
 import plotly.express as px
+import plotly.graph_objects as go
 import numpy as np
-import pandas as pd
-from utils.api_client import APIClient
+from utils import perf
+from utils.feed_ingest import numeric_feature_values
+from utils.feed_store import get_feed_store
 from utils.general_utils import (
     TIME_WINDOW_ALL,    
-    filter_dataframe_by_time,
+    get_time_window_start,
+    get_time_window_fetch_start,
 )
 
-from config import NEGATIVE_SENTIMENT_THRESHOLD, POSITIVE_SENTIMENT_THRESHOLD, SENTIMENT_COLORS
+from utils.downsample import downsample_frame
+from utils.rollups import merge_adjacent_buckets
+from config import (
+    NEGATIVE_SENTIMENT_THRESHOLD,
+    POSITIVE_SENTIMENT_THRESHOLD,
+    SENTIMENT_COLORS,
+    PLOT_DEFAULT_WIDTH_PX,
+    PLOT_POINTS_PER_PIXEL,
+    PLOT_WEBGL_THRESHOLD,
+)
 
 
+@perf.timed()
 def create_reddit_source_sentiment_plot(sentiment_scores, num_submissions, num_comments):
     """Create an interactive Plotly histogram of overall sentiment scores."""
     if isinstance(num_submissions, dict):
@@ -61,6 +74,7 @@ def create_reddit_source_sentiment_plot(sentiment_scores, num_submissions, num_c
 
 
 
+@perf.timed()
 def create_reddit_source_topic_plot(topic_sentiments, num_submissions, num_comments):
     """Create interactive Plotly histograms for each topic's sentiment scores."""
     topic_COLOR = "#1f77b4"
@@ -75,7 +89,8 @@ def create_reddit_source_topic_plot(topic_sentiments, num_submissions, num_comme
             avg_sentiment = np.mean(scores)
 
             fig = px.histogram(
-                x=scores,
+                # A topic's sentiment may be a single average rather than a list of scores
+                x=np.atleast_1d(scores),
                 nbins=20,
                 color_discrete_sequence=[color],
                 opacity=0.7,
@@ -168,65 +183,128 @@ def _create_common_layout(title, axis_labels=None):
     return layout
 
 
-def create_one_feature_plot(universe_name, source, topic, feature_name, time_window=TIME_WINDOW_ALL):
+def _add_range_bands(fig, buckets, group_col=None):
+    """Shade the min-max range of each rollup series (one per trace) behind its mean line."""
+    lines = list(fig.data)
+    for line in lines:
+        rows = buckets if group_col is None else buckets[buckets[group_col] == line.name]
+        band = dict(
+            x=rows["created_timestamp"],
+            mode="lines",
+            line=dict(width=0, color=line.line.color),
+            opacity=0.25,
+            legendgroup=line.legendgroup,
+            showlegend=False,
+            hoverinfo="skip",
+        )
+        fig.add_trace(go.Scatter(y=rows["max"], **band))
+        fig.add_trace(go.Scatter(y=rows["min"], fill="tonexty", **band))
+    # Draw the bands first so the lines stay on top
+    fig.data = fig.data[len(lines) :] + fig.data[: len(lines)]
+
+
+@perf.timed()
+def create_one_feature_plot(
+    universe_name,
+    source,
+    topic,
+    feature_name,
+    time_window=TIME_WINDOW_ALL,
+    plot_width_px=PLOT_DEFAULT_WIDTH_PX,
+    feature_data=None,
+):
     """
     Create a plot showing feature values over time from the feed data.
+
+    feature_data, when given, is this feature's rows already restricted to the time window
+    (e.g. one group of a topic frame loaded once for many plots); otherwise the rows are
+    sliced from the universe's feed store. Long windows of numeric series plot the bucket
+    means of the coarsest rollup that still fills the plot width instead of raw rows, with
+    the bucket min-max range shaded around them.
+
+    Numeric series are downsampled per trace to a point budget derived from plot_width_px,
+    and the figure switches to WebGL rendering when many points remain.
     """
     try:
         source = str(source) if source is not None else "unknown"
         feature_name = str(feature_name) if feature_name is not None else "unknown"
 
         if topic is None:
-            df = APIClient.get_feed_from_db(source=source, feature_name=feature_name, universe_name=universe_name)
             topic_display = ""
         else:
             topic = str(topic)
-            df = APIClient.get_feed_from_db(
-                source=source, topic=topic, feature_name=feature_name, universe_name=universe_name
-            )
             topic_display = topic
 
-        if df is None or df.empty:
-            print(f"No data available for {topic_display} {feature_name} from {source}")
-            return None, None
-
-        df = filter_dataframe_by_time(df, time_window)
+        max_points = int(plot_width_px * PLOT_POINTS_PER_PIXEL)
+        start = get_time_window_start(time_window)
+        store = get_feed_store(universe_name, since=get_time_window_fetch_start(time_window))
+        rollup_frequency = None
+        # Rollups only hold numeric rows, so text and mixed series are always plotted from raw rows
+        if store.is_numeric(source=source, topic=topic, feature_name=feature_name):
+            rollup_frequency = store.rollup_frequency(
+                source=source, topic=topic, feature_name=feature_name, start=start, min_points=max_points
+            )
+        if rollup_frequency is not None:
+            df = store.rollup_slice(rollup_frequency, source=source, topic=topic, feature_name=feature_name, start=start)
+            if df.empty:
+                rollup_frequency = None
+        if rollup_frequency is not None:
+            df = merge_adjacent_buckets(df, max_points)
+        elif feature_data is not None:
+            df = feature_data.copy()
+        else:
+            df = store.slice(source=source, topic=topic, feature_name=feature_name, start=start)
 
         if df.empty:
-            print(f"No data available for the selected time window: {time_window}")
+            print(f"No data available for {topic_display} {feature_name} from {source} for {time_window}")
             return None, None
 
         plot_key = f"{source}_{topic_display.replace(' ', '_')}_{feature_name}_{time_window}"
 
-        try:
-            df["feature_value"] = pd.to_numeric(df["feature_value"])
-            numeric_values = True
-        except (ValueError, TypeError):
-            numeric_values = False
+        values = numeric_feature_values(df)
+        numeric_values = bool(values.notna().all())
+        if numeric_values:
+            df["feature_value"] = values
+        else:
             print("Feature plot --- Feature values are not numeric and will be treated as categorical")
 
         if topic_display != "":
             plot_title = f"{topic_display} - {feature_name} from {source}"
         else:
             plot_title = f"{feature_name} from {source}"
+        if rollup_frequency is not None:
+            plot_title = f"{plot_title} ({rollup_frequency} mean and range)"
 
         plot_params = {
             "x": "created_timestamp",
             "y": "feature_value",
             "title": plot_title,
             "labels": {"created_timestamp": "Date & Time", "feature_value": feature_name},
-            "render_mode": "svg",
         }
 
         if topic is None:
+            df["topic"] = df["topic"].astype(str)
             plot_params["color"] = "topic"
             plot_params["labels"]["topic"] = "topic"
 
+        # Rollup buckets were already merged down to the point budget
+        if numeric_values and rollup_frequency is None:
+            df = downsample_frame(
+                df,
+                "created_timestamp",
+                "feature_value",
+                max_points=max_points,
+                group_col=plot_params.get("color"),
+            )
+        plot_params["render_mode"] = "webgl" if len(df) > PLOT_WEBGL_THRESHOLD else "svg"
+
         if numeric_values:
             plot_params["line_shape"] = "linear"
             fig = px.line(df, **plot_params)
         else:
             fig = px.scatter(df, **plot_params)
+        if rollup_frequency is not None:
+            _add_range_bands(fig, df, plot_params.get("color"))
 
         fig.update_layout(_create_common_layout(plot_title, {"x": "Date & Time", "y": feature_name}))
 
@@ -235,3 +313,49 @@ def create_one_feature_plot(universe_name, source, topic, feature_name, time_win
     except Exception as e:
         print(f"Error creating feature value plot: {e}")
         return None, None
+
+
+@perf.timed()
+def create_correlation_heatmap(corr, title="Correlation Matrix"):
+    """Create a heatmap of a square correlation matrix."""
+    fig = px.imshow(corr, color_continuous_scale="RdBu", zmin=-1, zmax=1, aspect="auto")
+    layout = _create_common_layout(title)
+    # Keep labels readable for large universes
+    layout["height"] = max(500, 22 * len(corr))
+    fig.update_layout(layout)
+    return fig
+
+
+@perf.timed()
+def create_lag_correlation_plot(lag_correlations, best=None, title="Correlation vs Lag"):
+    """Create a line plot of correlation against lag (positive lag: feed 1 leads feed 2)."""
+    plot_df = lag_correlations.assign(lag_hours=lag_correlations["lag_timedelta"].dt.total_seconds() / 3600)
+    fig = px.line(plot_df, x="lag_hours", y="correlation", hover_data=["overlap"])
+    fig.update_layout(
+        _create_common_layout(title, {"x": "Lag in hours (positive: feed 1 leads feed 2)", "y": "Correlation"})
+    )
+    fig.add_hline(y=0, line=dict(color="gray", width=1))
+    if best is not None:
+        fig.add_vline(x=best["lag_timedelta"].total_seconds() / 3600, line=dict(color="red", dash="dash"))
+    return fig
+
+
+@perf.timed()
+def create_rolling_correlation_plot(rolling, title="Rolling Correlation", plot_width_px=PLOT_DEFAULT_WIDTH_PX):
+    """
+    Create a line plot of a rolling correlation series.
+
+    Like create_one_feature_plot, the series is downsampled to a point budget derived from
+    plot_width_px and rendered with WebGL when many points remain.
+    """
+    rolling = downsample_frame(
+        rolling, "window_end", "correlation", max_points=int(plot_width_px * PLOT_POINTS_PER_PIXEL)
+    )
+    render_mode = "webgl" if len(rolling) > PLOT_WEBGL_THRESHOLD else "svg"
+    fig = px.line(rolling, x="window_end", y="correlation", hover_data=["count"], render_mode=render_mode)
+    layout = _create_common_layout(title, {"x": "Date & Time", "y": "Correlation"})
+    layout["height"] = 300
+    layout["yaxis"]["range"] = [-1, 1]
+    fig.update_layout(layout)
+    fig.add_hline(y=0, line=dict(color="gray", width=1))
+    return fig
@@ -0,0 +1,164 @@
+"""Pre-aggregated (rolled up) numeric feed values per series and time bucket."""
+
+import pandas as pd
+
+from config import FEED_ROLLUP_FREQUENCIES
+from utils.feed_ingest import numeric_feature_values, sort_by_time, to_utc
+
+# Rollup rows are indexed by series and bucket start
+ROLLUP_KEY_COLUMNS = ["source", "topic", "feature_name"]
+ROLLUP_INDEX_LEVELS = ROLLUP_KEY_COLUMNS + ["created_timestamp"]
+# Aggregates kept per bucket; the mean is derived as sum / count so buckets can be merged exactly
+ROLLUP_AGGREGATIONS = {
+    "sum": "sum",
+    "count": "sum",
+    "min": "min",
+    "max": "max",
+    "last": "last",
+    "last_timestamp": "max",
+}
+
+
+def _empty_rollup():
+    index = pd.MultiIndex.from_arrays(
+        [pd.Index([], dtype=str)] * len(ROLLUP_KEY_COLUMNS) + [pd.DatetimeIndex([], tz="UTC")],
+        names=ROLLUP_INDEX_LEVELS,
+    )
+    return pd.DataFrame({col: pd.Series(dtype="float64") for col in ROLLUP_AGGREGATIONS}, index=index)
+
+
+def aggregate_feed(df, frequency):
+    """Roll the numeric rows of a feed frame up into buckets of the given frequency."""
+    if df is None or df.empty or "feature_value" not in df.columns:
+        return _empty_rollup()
+
+    values = numeric_feature_values(df)
+    numeric = values.notna()
+    if not numeric.any():
+        return _empty_rollup()
+
+    df = df[numeric]
+    rows = pd.DataFrame({col: df[col].astype(str) for col in ROLLUP_KEY_COLUMNS})
+    rows["created_timestamp"] = df["created_timestamp"].dt.floor(frequency)
+    rows["value"] = values[numeric]
+    rows["timestamp"] = df["created_timestamp"]
+    # "last" must be the latest value of each bucket
+    rows = sort_by_time(rows, "timestamp")
+
+    return rows.groupby(ROLLUP_INDEX_LEVELS, sort=True).agg(
+        sum=("value", "sum"),
+        count=("value", "count"),
+        min=("value", "min"),
+        max=("value", "max"),
+        last=("value", "last"),
+        last_timestamp=("timestamp", "max"),
+    )
+
+
+def merge_rollups(base, update):
+    """Merge two rollups of the same frequency; buckets present in both are combined."""
+    if update.empty:
+        return base
+    if base.empty:
+        return update
+
+    touched = base.index.intersection(update.index)
+    if len(touched):
+        both = pd.concat([base.loc[touched], update.loc[touched]]).sort_values("last_timestamp", kind="stable")
+        combined = both.groupby(level=ROLLUP_INDEX_LEVELS, sort=False).agg(ROLLUP_AGGREGATIONS)
+        base = base.drop(touched)
+        update = pd.concat([update.drop(touched), combined])
+    return pd.concat([base, update]).sort_index()
+
+
+def merge_adjacent_buckets(buckets, max_points):
+    """
+    Merge runs of adjacent buckets of a rollup slice (see FeedRollups.slice) so no series has more than max_points.
+
+    Merged buckets keep the exact mean, min and max of the rows they cover, so unlike
+    point-picking downsampling no extreme is lost.
+    """
+    if buckets.empty or max_points is None:
+        return buckets
+    # Slices are ordered by series, then bucket start
+    series = buckets.groupby(ROLLUP_KEY_COLUMNS, sort=False)
+    sizes = series["created_timestamp"].transform("size")
+    if (sizes <= max_points).all():
+        return buckets
+    factor = -(-sizes // max_points)  # ceil(size / max_points) buckets merged per point
+    run = series.cumcount() // factor
+    aggregations = {col: (col, agg) for col, agg in ROLLUP_AGGREGATIONS.items()}
+    merged = buckets.groupby(ROLLUP_KEY_COLUMNS + [run.rename("_run")], sort=False).agg(
+        created_timestamp=("created_timestamp", "first"), **aggregations
+    )
+    merged = merged.reset_index(level=ROLLUP_KEY_COLUMNS).reset_index(drop=True)
+    merged["feature_value"] = merged["sum"] / merged["count"]
+    return merged
+
+
+def pick_rollup_frequency(start, end, min_points, max_frequency=None):
+    """
+    Return the coarsest rollup frequency that leaves at least min_points buckets in [start, end].
+
+    Frequencies coarser than max_frequency are skipped. Returns None when no rollup qualifies.
+    """
+    span = pd.Timedelta(end - start)
+    for frequency in reversed(FEED_ROLLUP_FREQUENCIES):
+        bucket = pd.Timedelta(frequency)
+        if max_frequency is not None and bucket > pd.Timedelta(max_frequency):
+            continue
+        if span / bucket >= min_points:
+            return frequency
+    return None
+
+
+class FeedRollups:
+    """
+    Rollups of a feed frame at every FEED_ROLLUP_FREQUENCIES frequency.
+
+    Each bucket keeps sum, count, min, max and last value. Instances are not modified;
+    update() returns a new instance covering the extra rows, touching only their buckets.
+    """
+
+    def __init__(self, rollups):
+        self._rollups = rollups
+
+    @classmethod
+    def from_frame(cls, df):
+        return cls({frequency: aggregate_feed(df, frequency) for frequency in FEED_ROLLUP_FREQUENCIES})
+
+    def update(self, new_rows):
+        """Return the rollups with new_rows (rows not yet included) added."""
+        if new_rows is None or new_rows.empty:
+            return self
+        return FeedRollups(
+            {
+                frequency: merge_rollups(rollup, aggregate_feed(new_rows, frequency))
+                for frequency, rollup in self._rollups.items()
+            }
+        )
+
+    def row_count(self, frequency):
+        return len(self._rollups[frequency])
+
+    @property
+    def nbytes(self):
+        return int(sum(rollup.memory_usage(deep=True, index=True).sum() for rollup in self._rollups.values()))
+
+    def slice(self, frequency, source=None, topic=None, feature_name=None, start=None, end=None):
+        """
+        Return the buckets of the matching series whose start lies in [start, end], shaped like feed rows.
+
+        created_timestamp is the bucket start and feature_value the bucket mean; the other
+        aggregates are kept as extra columns. Any key left as None matches all values.
+        """
+        rollup = self._rollups[frequency]
+        key = tuple(slice(None) if value is None else str(value) for value in (source, topic, feature_name))
+        start = to_utc(start).floor(frequency) if start is not None else None
+        try:
+            result = rollup.loc[key + (slice(start, to_utc(end)),), :]
+        except (KeyError, TypeError):
+            result = rollup.iloc[0:0]
+        result = result.reset_index()
+        result["feature_value"] = result["sum"] / result["count"]
+        return result
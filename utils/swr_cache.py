@@ -0,0 +1,242 @@
+"""Stale-while-revalidate caching for API client calls."""
+
+import copy
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from utils import perf
+from utils.memory_budget import nbytes
+from config import API_CACHE_TTL, API_CACHE_MAX_STALE, API_CACHE_MAX_ENTRIES, API_CACHE_REFRESH_WORKERS
+
+_refresh_executor = ThreadPoolExecutor(max_workers=API_CACHE_REFRESH_WORKERS, thread_name_prefix="swr-refresh")
+_caches = []
+_background_keys = set()
+_background_lock = threading.Lock()
+
+
+def bind_call(signature, args, kwargs):
+    """Return a call's arguments by name, defaults included."""
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return bound.arguments
+
+
+def call_key(signature, args, kwargs):
+    """Build a cache key for a call, treating positional and keyword forms (and defaults) alike."""
+    return repr(tuple(bind_call(signature, args, kwargs).items()))
+
+
+def in_scope(arguments, scope):
+    """
+    Tell whether a call's arguments fall within an invalidation scope.
+
+    An argument left as None is unfiltered, so its result also covers (and is
+    affected by) any scoped value: a whole-universe fetch is in scope of one of its sources.
+    """
+    return all(arguments.get(name) is None or arguments.get(name) == value for name, value in scope.items())
+
+
+def _copy_value(value):
+    # Callers may modify what they get back, so never hand out the cached object itself
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    return copy.deepcopy(value)
+
+
+class SWRCache:
+    """
+    Cache of function results that serves stale values while refreshing them in the background.
+
+    Values younger than ttl are served as is. Older values are still served immediately
+    while one background refresh per key runs, up to max_stale seconds of age; past
+    that the caller waits for a fresh value. A failed refresh keeps the stale value.
+    """
+
+    def __init__(self, func, ttl, max_stale, max_entries, fallback, namespace, budget=None):
+        self.func = func
+        self.namespace = namespace
+        self.budget = budget
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self.fallback = fallback
+        self._signature = inspect.signature(func)
+        self._counter_name = f"swr_cache {func.__qualname__}"
+        self._entries = OrderedDict()  # key -> (value, fetched_at)
+        self._arguments = {}  # key -> bound call arguments, for scoped invalidation
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        arguments = bind_call(self._signature, args, kwargs)
+        key = repr(tuple(arguments.items()))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None and self.budget is not None:
+            self.budget.touch(self, key)
+
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.time() - fetched_at
+            if age < self.ttl:
+                perf.count(self._counter_name, "hit")
+                return _copy_value(value)
+            if age < self.max_stale:
+                perf.count(self._counter_name, "stale")
+                self._schedule_refresh(key, args, kwargs)
+                return _copy_value(value)
+
+        perf.count(self._counter_name, "miss")
+        try:
+            value = self._fetch(key, args, kwargs, arguments)
+        except Exception as e:
+            print(f"Error in {self.func.__name__}: {e}")
+            return _copy_value(self.fallback)
+        return _copy_value(value)
+
+    def _fetch(self, key, args, kwargs, arguments=None):
+        value = self.func(*args, **kwargs)
+        evicted = []
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            if arguments is not None:
+                self._arguments[key] = arguments
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[0])
+                self._arguments.pop(evicted[-1], None)
+        if self.budget is not None:
+            for evicted_key in evicted:
+                self.budget.remove(self, evicted_key)
+            self.budget.add(self, key, nbytes(value), self._evict)
+        return value
+
+    def _evict(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._arguments.pop(key, None)
+
+    def _schedule_refresh(self, key, args, kwargs):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        _refresh_executor.submit(self._refresh, key, args, kwargs)
+
+    def _refresh(self, key, args, kwargs):
+        try:
+            self._fetch(key, args, kwargs)
+        except Exception as e:
+            print(f"Background refresh of {self.func.__name__} failed, keeping stale value: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def clear(self):
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+            self._arguments.clear()
+        self._release(keys)
+
+    def _release(self, keys):
+        if self.budget is not None:
+            for key in keys:
+                self.budget.remove(self, key)
+
+    def accepts(self, scope):
+        """Tell whether every scoped name is a parameter of the cached function."""
+        return all(name in self._signature.parameters for name in scope)
+
+    def invalidate(self, **scope):
+        """Drop the entries whose call arguments fall within scope (see in_scope); return how many."""
+        with self._lock:
+            keys = [key for key in self._entries if in_scope(self._arguments.get(key, {}), scope)]
+            for key in keys:
+                del self._entries[key]
+                self._arguments.pop(key, None)
+        self._release(keys)
+        return len(keys)
+
+
+def refresh_in_background(key, fn, *args, **kwargs):
+    """
+    Run fn(*args, **kwargs) on the refresh threads unless a refresh for key is already pending.
+
+    For caches that serve stale values themselves instead of through swr_cache; failures are
+    only logged, so the stale value stays in place.
+    """
+    with _background_lock:
+        if key in _background_keys:
+            return
+        _background_keys.add(key)
+
+    def run():
+        try:
+            fn(*args, **kwargs)
+        except Exception as e:
+            print(f"Background refresh of {getattr(fn, '__name__', fn)} failed, keeping stale value: {e}")
+        finally:
+            with _background_lock:
+                _background_keys.discard(key)
+
+    _refresh_executor.submit(run)
+
+
+def swr_cache(
+    ttl=API_CACHE_TTL,
+    max_stale=API_CACHE_MAX_STALE,
+    max_entries=API_CACHE_MAX_ENTRIES,
+    fallback=None,
+    namespace=None,
+    budget=None,
+):
+    """
+    Decorate a function with a stale-while-revalidate cache.
+
+    The function should raise on failure; callers then get a copy of fallback and nothing is cached.
+    namespace groups caches for invalidate(); with a MemoryBudget, results are also evicted by size.
+    """
+
+    def decorator(func):
+        cache = SWRCache(func, ttl, max_stale, max_entries, fallback, namespace, budget)
+        _caches.append(cache)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return cache(*args, **kwargs)
+
+        wrapper.clear = cache.clear
+        wrapper.invalidate = cache.invalidate
+        return wrapper
+
+    return decorator
+
+
+def clear_all():
+    """Clear every stale-while-revalidate cache."""
+    for cache in _caches:
+        cache.clear()
+
+
+def invalidate(namespace=None, **scope):
+    """
+    Drop the cached results within scope from the caches of a namespace (or of all namespaces).
+
+    Only caches whose function takes every scoped argument are affected, so
+    invalidate("feed", universe_name="U1") leaves caches without a universe_name alone.
+    Returns the number of entries dropped.
+    """
+    dropped = 0
+    for cache in _caches:
+        if (namespace is None or cache.namespace == namespace) and cache.accepts(scope):
+            dropped += cache.invalidate(**scope)
+    return dropped